@@ -9,6 +9,10 @@ Provides three dependency injection patterns:
 - require_tenant: Dependency factory for endpoints that need tenant context
 
 Auth can be disabled via MOAT_AUTH_DISABLED=true for local development.
+
+The decoded payload is cached on ``request.state`` (``auth_payload`` and
+``tenant_id``), so every auth dependency in a request, and any code running
+after them, shares one decode.
 """
 
 from __future__ import annotations
@@ -65,6 +69,9 @@ class AuthConfig:
         )
 
 
+# Tenant used when auth is disabled and no X-Tenant-ID header is sent
+_DEV_TENANT = "dev-tenant"
+
 # Global config instance (configured at service startup)
 _auth_config: AuthConfig | None = None
 
@@ -120,19 +127,25 @@ async def _extract_token(
     Returns None if no token provided (for optional auth).
     Raises HTTPException for invalid/expired tokens.
     """
+    cached: JWTPayload | None = getattr(request.state, "auth_payload", None)
+    if cached is not None:
+        return cached
+
     config = get_auth_config()
 
     # Auth disabled - return mock tenant from header or default
     if config.auth_disabled:
         # Allow X-Tenant-ID header for testing without JWT
-        tenant_id = request.headers.get("X-Tenant-ID", "dev-tenant")
-        return JWTPayload(
+        tenant_id = request.headers.get("X-Tenant-ID", _DEV_TENANT)
+        payload = JWTPayload(
             tenant_id=tenant_id,
             issued_at=0,
             expires_at=0,
             issuer=None,
             raw_claims={"_auth_disabled": True},
         )
+        _cache_payload(request, payload)
+        return payload
 
     # No credentials provided
     if credentials is None:
@@ -140,7 +153,7 @@ async def _extract_token(
 
     # Validate JWT
     try:
-        return decode_jwt(credentials.credentials, config.to_jwt_config())
+        payload = decode_jwt(credentials.credentials, config.to_jwt_config())
     except JWTExpiredError as exc:
         logger.debug("JWT expired", extra={"path": request.url.path})
         raise HTTPException(
@@ -158,6 +171,13 @@ async def _extract_token(
             detail="Invalid authentication token",
             headers={"WWW-Authenticate": "Bearer"},
         ) from exc
+    _cache_payload(request, payload)
+    return payload
+
+
+def _cache_payload(request: Request, payload: JWTPayload) -> None:
+    request.state.auth_payload = payload
+    request.state.tenant_id = payload.tenant_id
 
 
 async def get_current_tenant(
@@ -9,6 +9,7 @@ via the DATABASE_URL connection string.
 
 from __future__ import annotations
 
+from sqlalchemy import Connection, text
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
     AsyncSession,
@@ -22,6 +23,14 @@ class Base(DeclarativeBase):
     """Shared declarative base for all Moat ORM models."""
 
 
+# Indexes dropped from the models. init_tables() removes them from existing
+# databases so those converge on the schema a fresh database gets.
+_SUPERSEDED_INDEXES: tuple[str, ...] = (
+    # outcome_events.capability_id; ix_outcome_events_cap_time leads with it.
+    "ix_outcome_events_capability_id",
+)
+
+
 def create_engine(url: str, echo: bool = False) -> AsyncEngine:
     """Create an async SQLAlchemy engine from a database URL.
 
@@ -53,10 +62,22 @@ def create_session_factory(engine: AsyncEngine) -> async_sessionmaker[AsyncSessi
 
 
 async def init_tables(engine: AsyncEngine) -> None:
-    """Create all tables defined on :class:`Base` if they do not exist.
+    """Create all tables and indexes defined on :class:`Base` if they do not exist.
 
     Safe to call repeatedly - uses ``CREATE TABLE IF NOT EXISTS``.
+    ``create_all`` only creates indexes along with a new table, so indexes
+    added to a model later are created here for existing tables too, and
+    :data:`_SUPERSEDED_INDEXES` are dropped.
     In production, prefer Alembic migrations over this function.
     """
     async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(_sync_schema)
+
+
+def _sync_schema(conn: Connection) -> None:
+    Base.metadata.create_all(conn)
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(conn, checkfirst=True)
+    for name in _SUPERSEDED_INDEXES:
+        conn.execute(text(f"DROP INDEX IF EXISTS {name}"))
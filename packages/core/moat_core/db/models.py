@@ -18,6 +18,7 @@ from sqlalchemy import (
     Boolean,
     DateTime,
     Float,
+    Index,
     Integer,
     String,
     Text,
@@ -132,7 +133,8 @@ class OutcomeEventRow(Base):
     __tablename__ = "outcome_events"
 
     event_id: Mapped[str] = mapped_column(String(64), primary_key=True)
-    capability_id: Mapped[str] = mapped_column(String(64), nullable=False, index=True)
+    # Indexed as the leading column of ix_outcome_events_cap_time.
+    capability_id: Mapped[str] = mapped_column(String(64), nullable=False)
     tenant_id: Mapped[str] = mapped_column(String(128), nullable=False, index=True)
     receipt_id: Mapped[str] = mapped_column(String(64), default="")
     success: Mapped[bool] = mapped_column(Boolean, nullable=False)
@@ -144,6 +146,20 @@ class OutcomeEventRow(Base):
         DateTime(timezone=True), default=lambda: datetime.now(UTC)
     )
 
+    __table_args__ = (
+        # Stats windows: range seek on (capability_id, occurred_at) that also
+        # yields rows in time order. On Postgres the aggregated columns are
+        # included so the scan can be index-only.
+        Index(
+            "ix_outcome_events_cap_time",
+            "capability_id",
+            "occurred_at",
+            postgresql_include=["success", "latency_ms"],
+        ),
+        # Window-wide queries (event count, all-capability stats).
+        Index("ix_outcome_events_time", "occurred_at"),
+    )
+
 
 class PolicyBundleRow(Base):
     """Tenant-scoped policy bundle for capability access control."""
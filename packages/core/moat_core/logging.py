@@ -25,6 +25,11 @@ import logging
 import sys
 from typing import Any
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is an optional speedup
+    orjson = None  # type: ignore[assignment]
+
 # Field names whose values should never be logged verbatim.
 SENSITIVE_KEYS: frozenset[str] = frozenset(
     {
@@ -116,7 +121,23 @@ class JsonFormatter(logging.Formatter):
         if record.exc_info:
             payload["exc_info"] = self.formatException(record.exc_info)
 
-        return json.dumps(payload, default=str)
+        return _dumps(payload)
+
+
+def _dumps(payload: dict[str, Any]) -> str:
+    """Encode a log payload, preferring orjson when it is installed.
+
+    Falls back to the stdlib encoder for values orjson rejects (e.g.
+    integers wider than 64 bits) so that logging never raises.
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(
+                payload, default=str, option=orjson.OPT_NON_STR_KEYS
+            ).decode()
+        except orjson.JSONEncodeError:
+            pass
+    return json.dumps(payload, default=str)
 
 
 def configure_logging(
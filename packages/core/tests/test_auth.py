@@ -7,6 +7,8 @@ from __future__ import annotations
 import time
 
 import pytest
+from fastapi.security import HTTPAuthorizationCredentials
+from starlette.requests import Request
 
 from moat_core.auth import (
     JWTConfig,
@@ -14,6 +16,12 @@ from moat_core.auth import (
     decode_jwt,
 )
 from moat_core.auth.jwt import JWTExpiredError, JWTInvalidError
+from moat_core.auth.middleware import (
+    AuthConfig,
+    configure_auth,
+    get_current_tenant,
+    get_optional_tenant,
+)
 
 
 class TestJWTCreation:
@@ -167,3 +175,49 @@ class TestJWTConfig:
         config = JWTConfig(secret="test")
         with pytest.raises(AttributeError):
             config.secret = "new-secret"  # type: ignore
+
+
+def _request(headers: dict[str, str] | None = None) -> Request:
+    raw = [(k.lower().encode(), v.encode()) for k, v in (headers or {}).items()]
+    return Request({"type": "http", "headers": raw, "path": "/", "state": {}})
+
+
+class TestTenantDependencies:
+    """Test the FastAPI tenant dependencies."""
+
+    @pytest.fixture(autouse=True)
+    def _reset_auth(self, monkeypatch):
+        from moat_core.auth import middleware
+
+        monkeypatch.setattr(middleware, "_auth_config", None)
+
+    async def test_auth_disabled_defaults_to_dev_tenant(self):
+        """Without X-Tenant-ID the shared dev tenant is used."""
+        configure_auth(AuthConfig(auth_disabled=True))
+        request = _request()
+        assert await get_current_tenant(request, None) == "dev-tenant"
+        assert request.state.tenant_id == "dev-tenant"
+
+        request = _request({"X-Tenant-ID": "tenant-9"})
+        assert await get_current_tenant(request, None) == "tenant-9"
+
+    async def test_payload_decoded_once_per_request(self):
+        """Later auth dependencies reuse the payload cached on request.state."""
+        secret = "s" * 32
+        configure_auth(AuthConfig(jwt_secret=secret))
+        token = create_jwt("tenant-123", JWTConfig(secret=secret))
+        creds = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+        request = _request()
+
+        assert await get_current_tenant(request, creds) == "tenant-123"
+        payload = request.state.auth_payload
+        assert request.state.tenant_id == "tenant-123"
+
+        assert await get_optional_tenant(request, None) == "tenant-123"
+        assert request.state.auth_payload is payload
+
+    async def test_missing_credentials_not_cached(self):
+        configure_auth(AuthConfig(jwt_secret="s" * 32))
+        request = _request()
+        assert await get_optional_tenant(request, None) is None
+        assert not hasattr(request.state, "tenant_id")
@@ -0,0 +1,80 @@
+"""
+Tests for moat_core.db.
+
+Covers: init_tables() bringing an existing database's indexes in line with
+the models.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from sqlalchemy import inspect, text
+
+from moat_core.db import create_engine, init_tables
+
+
+async def _outcome_event_indexes(url: str) -> set[str]:
+    engine = create_engine(url)
+    try:
+        async with engine.connect() as conn:
+            indexes = await conn.run_sync(
+                lambda sync_conn: inspect(sync_conn).get_indexes("outcome_events")
+            )
+    finally:
+        await engine.dispose()
+    return {index["name"] for index in indexes}
+
+
+async def test_init_tables_migrates_outcome_event_indexes(tmp_path: Path) -> None:
+    url = f"sqlite+aiosqlite:///{tmp_path / 'old.db'}"
+    engine = create_engine(url)
+    # outcome_events as created before the composite index was added.
+    async with engine.begin() as conn:
+        await conn.execute(
+            text(
+                "CREATE TABLE outcome_events ("
+                "event_id VARCHAR(64) PRIMARY KEY, "
+                "capability_id VARCHAR(64) NOT NULL, "
+                "tenant_id VARCHAR(128) NOT NULL, "
+                "receipt_id VARCHAR(64), "
+                "success BOOLEAN NOT NULL, "
+                "latency_ms FLOAT NOT NULL, "
+                "occurred_at DATETIME, "
+                "created_at DATETIME)"
+            )
+        )
+        await conn.execute(
+            text(
+                "CREATE INDEX ix_outcome_events_capability_id "
+                "ON outcome_events (capability_id)"
+            )
+        )
+        await conn.execute(
+            text(
+                "CREATE INDEX ix_outcome_events_tenant_id ON outcome_events (tenant_id)"
+            )
+        )
+
+    await init_tables(engine)
+    await init_tables(engine)  # idempotent
+    await engine.dispose()
+
+    assert await _outcome_event_indexes(url) == {
+        "ix_outcome_events_cap_time",
+        "ix_outcome_events_time",
+        "ix_outcome_events_tenant_id",
+    }
+
+
+async def test_init_tables_fresh_database(tmp_path: Path) -> None:
+    url = f"sqlite+aiosqlite:///{tmp_path / 'new.db'}"
+    engine = create_engine(url)
+    await init_tables(engine)
+    await engine.dispose()
+
+    assert await _outcome_event_indexes(url) == {
+        "ix_outcome_events_cap_time",
+        "ix_outcome_events_time",
+        "ix_outcome_events_tenant_id",
+    }
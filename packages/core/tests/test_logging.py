@@ -0,0 +1,63 @@
+"""
+Tests for moat_core.logging.
+
+Covers: standard and extra fields, redaction of sensitive extras,
+encoding of values JSON cannot represent natively, and the orjson encoder
+with its stdlib fallback.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+from datetime import UTC, datetime
+
+import pytest
+
+from moat_core import logging as moat_logging
+from moat_core.logging import JsonFormatter
+
+
+def _format(**extra: object) -> dict[str, object]:
+    record = logging.LogRecord("moat.test", logging.INFO, __file__, 1, "hi", (), None)
+    record.__dict__.update(extra)
+    return json.loads(JsonFormatter(service_name="svc").format(record))
+
+
+def test_standard_fields() -> None:
+    payload = _format()
+    assert payload["level"] == "INFO"
+    assert payload["logger"] == "moat.test"
+    assert payload["message"] == "hi"
+    assert payload["service"] == "svc"
+    assert "lineno" not in payload
+
+
+def test_extra_fields_are_redacted() -> None:
+    payload = _format(capability_id="cap-1", api_key="sk-1", body={"token": "t"})
+    assert payload["capability_id"] == "cap-1"
+    assert payload["api_key"] == "[REDACTED]"
+    assert payload["body"] == {"token": "[REDACTED]"}
+
+
+def test_non_json_values_are_stringified() -> None:
+    at = datetime(2025, 1, 1, tzinfo=UTC)
+    payload = _format(at=at, huge=2**70, obj=object())
+    assert payload["at"].startswith("2025-01-01")
+    assert payload["huge"] == 2**70
+    assert payload["obj"].startswith("<object object")
+
+
+def test_orjson_encodes_when_installed() -> None:
+    orjson = pytest.importorskip("orjson")
+    payload = {"message": "hi", "n": 1}
+    assert moat_logging.orjson is orjson
+    # orjson's compact output, not json.dumps' ", " / ": " separators.
+    assert moat_logging._dumps(payload) == '{"message":"hi","n":1}'
+
+
+def test_stdlib_fallback_without_orjson(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(moat_logging, "orjson", None)
+    assert moat_logging._dumps({"message": "hi", "n": 1}) == (
+        '{"message": "hi", "n": 1}'
+    )
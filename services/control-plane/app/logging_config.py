@@ -44,6 +44,35 @@ def _redact(value: Any, key: str = "") -> Any:
     return value
 
 
+# Standard LogRecord attributes; anything else on a record came from ``extra``.
+_RESERVED_LOG_KEYS: frozenset[str] = frozenset(
+    {
+        "args",
+        "asctime",
+        "created",
+        "exc_info",
+        "exc_text",
+        "filename",
+        "funcName",
+        "levelname",
+        "levelno",
+        "lineno",
+        "message",
+        "module",
+        "msecs",
+        "msg",
+        "name",
+        "pathname",
+        "process",
+        "processName",
+        "relativeCreated",
+        "stack_info",
+        "thread",
+        "threadName",
+    }
+)
+
+
 class JsonFormatter(logging.Formatter):
     """Emit each log record as a single JSON line."""
 
@@ -57,30 +86,7 @@ class JsonFormatter(logging.Formatter):
 
         # Attach any extra fields the caller injected.
         for key, val in record.__dict__.items():
-            if key not in {
-                "args",
-                "asctime",
-                "created",
-                "exc_info",
-                "exc_text",
-                "filename",
-                "funcName",
-                "levelname",
-                "levelno",
-                "lineno",
-                "message",
-                "module",
-                "msecs",
-                "msg",
-                "name",
-                "pathname",
-                "process",
-                "processName",
-                "relativeCreated",
-                "stack_info",
-                "thread",
-                "threadName",
-            }:
+            if key not in _RESERVED_LOG_KEYS:
                 payload[key] = _redact(val, key)
 
         if record.exc_info:
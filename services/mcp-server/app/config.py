@@ -27,9 +27,26 @@ class Settings(BaseSettings):
 
     # HTTP client config
     HTTP_TIMEOUT: float = 30.0
+    HTTP_CONNECT_TIMEOUT: float = 2.0
+    HTTP_MAX_CONNECTIONS: int = 200
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 100
+    HTTP_KEEPALIVE_EXPIRY: float = 30.0
+
+    # Gateway executions a capabilities.executeBatch layer runs at once
+    BATCH_MAX_CONCURRENCY: int = 10
+
+    # Seconds a capability listing is reused by capabilities.search (0 = off)
+    CAPS_CACHE_TTL: float = 5.0
+
+    # Seconds trust plane stats are reused per capability (0 = off)
+    TP_STATS_CACHE_TTL: float = 3.0
+
+    # Seconds a successful gwi.triage receipt is reused per tenant/URL (0 = off)
+    TRIAGE_CACHE_TTL: float = 60.0
 
     # Observability
     LOG_LEVEL: str = "INFO"
+    MOAT_MCP_PRETTY: bool = False  # Indent stdio tool output for debugging
 
     # Authentication
     MOAT_JWT_SECRET: str = ""  # Required when auth is enabled
@@ -44,6 +61,10 @@ class Settings(BaseSettings):
     # Server
     HOST: str = "0.0.0.0"
     PORT: int = 8004
+    # uvicorn worker processes (app.serve). Each worker has its own upstream
+    # caches and connection pool, so more workers also means more cache
+    # misses; raise it deliberately, sized to the container's CPU limit.
+    WORKERS: int = 1
 
 
 settings = Settings()
@@ -6,52 +6,182 @@ Shared async HTTP client helpers for calling upstream Moat services.
 Each function makes a best-effort call to an upstream service. If the
 service is unreachable, a stub response is returned with a ``_stub: true``
 field so callers can distinguish real from fallback data.
+
+Both transports own one pooled client for their whole lifetime (see
+:func:`create_client`; the REST app hands it out via :func:`get_http_client`)
+and pass it to each helper as ``client``. Without one, a helper opens a
+throwaway client for that single call.
 """
 
 from __future__ import annotations
 
+import asyncio
 import logging
-from typing import Any
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable, Mapping, Sequence
+from contextlib import asynccontextmanager
+from typing import Any, TypeVar
+from urllib.parse import urlencode
 
 import httpx
+from fastapi import Request
 
 from app.config import settings
 
 logger = logging.getLogger(__name__)
 
 
+def create_client() -> httpx.AsyncClient:
+    """Build the pooled upstream client shared across requests.
+
+    Keep-alive connections skip the TCP/TLS handshake on every upstream
+    call, and HTTP/2 (negotiated over TLS) multiplexes concurrent calls to
+    the same service over a single connection.
+    """
+    return httpx.AsyncClient(
+        http2=True,
+        limits=httpx.Limits(
+            max_connections=settings.HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY,
+        ),
+        timeout=httpx.Timeout(
+            settings.HTTP_TIMEOUT, connect=settings.HTTP_CONNECT_TIMEOUT
+        ),
+    )
+
+
+def get_http_client(request: Request) -> httpx.AsyncClient:
+    """FastAPI dependency returning the app-wide client from ``app.state``."""
+    return request.app.state.http
+
+
+@asynccontextmanager
+async def _borrow(client: httpx.AsyncClient | None) -> AsyncIterator[httpx.AsyncClient]:
+    """Yield ``client``, or a single-use client when none was supplied."""
+    if client is not None:
+        yield client
+        return
+    async with httpx.AsyncClient(timeout=settings.HTTP_TIMEOUT) as temp:
+        yield temp
+
+
+def _as_stub(stub_response: dict[str, Any], exc: httpx.HTTPError) -> dict[str, Any]:
+    stub_response["_stub"] = True
+    stub_response["_error"] = str(exc)
+    return stub_response
+
+
 async def _get(
     url: str,
     *,
+    client: httpx.AsyncClient | None = None,
     params: dict[str, str] | None = None,
     stub_response: dict[str, Any],
 ) -> dict[str, Any]:
-    """Perform a GET request, returning ``stub_response`` on any HTTP error."""
+    """Perform a GET request, returning ``stub_response`` on any HTTP error.
+
+    ``stub_response`` is marked up in place, so callers pass a fresh dict.
+    """
     try:
-        async with httpx.AsyncClient(timeout=settings.HTTP_TIMEOUT) as client:
-            resp = await client.get(url, params=params)
+        async with _borrow(client) as http:
+            resp = await http.get(url, params=params)
             resp.raise_for_status()
             return resp.json()
     except httpx.HTTPError as exc:
         logger.warning("Upstream GET failed", extra={"url": url, "error": str(exc)})
-        return {**stub_response, "_stub": True, "_error": str(exc)}
+        return _as_stub(stub_response, exc)
 
 
 async def _post(
     url: str,
     payload: dict[str, Any],
     *,
+    client: httpx.AsyncClient | None = None,
     stub_response: dict[str, Any],
 ) -> dict[str, Any]:
-    """Perform a POST request, returning ``stub_response`` on any HTTP error."""
+    """Perform a POST request, returning ``stub_response`` on any HTTP error.
+
+    ``stub_response`` is marked up in place, so callers pass a fresh dict.
+    """
     try:
-        async with httpx.AsyncClient(timeout=settings.HTTP_TIMEOUT) as client:
-            resp = await client.post(url, json=payload)
+        async with _borrow(client) as http:
+            resp = await http.post(url, json=payload)
             resp.raise_for_status()
             return resp.json()
     except httpx.HTTPError as exc:
         logger.warning("Upstream POST failed", extra={"url": url, "error": str(exc)})
-        return {**stub_response, "_stub": True, "_error": str(exc)}
+        return _as_stub(stub_response, exc)
+
+
+_K = TypeVar("_K")
+_V = TypeVar("_V")
+
+
+def _cache_get(cache: dict[_K, tuple[float, _V]], key: _K, ttl: float) -> _V | None:
+    """Return the cached value for ``key`` if younger than ``ttl`` seconds.
+
+    An expired entry is removed when found.
+    """
+    entry = cache.get(key)
+    if entry is None:
+        return None
+    if time.monotonic() - entry[0] < ttl:
+        return entry[1]
+    del cache[key]
+    return None
+
+
+def _cache_put(
+    cache: dict[_K, tuple[float, _V]], key: _K, value: _V, max_entries: int
+) -> None:
+    """Store ``value`` under ``key``, evicting the oldest entry when full.
+
+    Dicts keep insertion order and every entry shares one TTL, so the first
+    key is always the oldest fetch and the next to expire.
+    """
+    cache.pop(key, None)
+    if len(cache) >= max_entries:
+        del cache[next(iter(cache))]
+    cache[key] = (time.monotonic(), value)
+
+
+async def _single_flight(
+    inflight: dict[_K, asyncio.Future[_V]],
+    key: _K,
+    fetch: Callable[[], Awaitable[_V]],
+) -> _V:
+    """Run ``fetch()`` at most once per ``key`` at a time.
+
+    Callers arriving while a fetch for ``key`` is running await its outcome
+    instead of issuing their own upstream request.
+    """
+    future = inflight.get(key)
+    if future is not None:
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            if not future.cancelled():
+                raise  # this caller was cancelled, not the shared fetch
+        # The caller running the fetch was cancelled; fetch independently.
+        return await _single_flight(inflight, key, fetch)
+
+    future = asyncio.get_running_loop().create_future()
+    inflight[key] = future
+    try:
+        result = await fetch()
+    except asyncio.CancelledError:
+        future.cancel()
+        raise
+    except BaseException as exc:
+        future.set_exception(exc)
+        future.exception()  # mark retrieved when no one else was waiting
+        raise
+    else:
+        future.set_result(result)
+        return result
+    finally:
+        del inflight[key]
 
 
 # ---------------------------------------------------------------------------
@@ -62,6 +192,9 @@ async def _post(
 async def cp_list_capabilities(
     provider: str | None = None,
     status: str | None = None,
+    verified: bool | None = None,
+    *,
+    client: httpx.AsyncClient | None = None,
 ) -> dict[str, Any]:
     url = f"{settings.CONTROL_PLANE_URL}/capabilities"
     query_params: dict[str, str] = {}
@@ -69,8 +202,11 @@ async def cp_list_capabilities(
         query_params["provider"] = provider
     if status:
         query_params["status"] = status
-    return await _get(
+    if verified is not None:
+        query_params["verified"] = "true" if verified else "false"
+    data = await _get(
         url,
+        client=client,
         params=query_params or None,
         stub_response={
             "items": [],
@@ -78,13 +214,24 @@ async def cp_list_capabilities(
             "_note": "Control plane unreachable - returning empty stub",
         },
     )
+    if verified is not None and not data.get("_stub"):
+        # The control plane ignores ``verified`` until it merges trust plane
+        # data, so apply it here in one pass over the freshly decoded body.
+        items = data.setdefault("items", [])
+        items[:] = [item for item in items if item.get("verified") == verified]
+        data["total"] = len(items)
+    return data
 
 
-async def cp_get_capability(capability_id: str) -> dict[str, Any] | None:
+async def cp_get_capability(
+    capability_id: str,
+    *,
+    client: httpx.AsyncClient | None = None,
+) -> dict[str, Any] | None:
     url = f"{settings.CONTROL_PLANE_URL}/capabilities/{capability_id}"
     try:
-        async with httpx.AsyncClient(timeout=settings.HTTP_TIMEOUT) as client:
-            resp = await client.get(url)
+        async with _borrow(client) as http:
+            resp = await http.get(url)
             if resp.status_code == 404:
                 return None
             resp.raise_for_status()
@@ -102,6 +249,84 @@ async def cp_get_capability(capability_id: str) -> dict[str, Any] | None:
         }
 
 
+# Filter key -> (fetched_at, response, search rows). The capability registry
+# changes rarely, so search can reuse a listing for CAPS_CACHE_TTL seconds
+# instead of paying an upstream round trip per query. Each listing is indexed
+# once as (item, lowercased "name\ndescription\ntags") rows so a query costs
+# one substring test per item. Stub responses are never cached.
+_CapsKey = tuple[str | None, str | None]
+_SearchRow = tuple[dict[str, Any], str]
+_CapsListing = tuple[dict[str, Any], list[_SearchRow]]
+_CAPS_CACHE: dict[_CapsKey, tuple[float, dict[str, Any], list[_SearchRow]]] = {}
+_CAPS_INFLIGHT: dict[_CapsKey, asyncio.Future[_CapsListing]] = {}
+
+
+def _search_rows(items: list[dict[str, Any]]) -> list[_SearchRow]:
+    return [
+        (
+            item,
+            "\n".join(
+                (
+                    item.get("name") or "",
+                    item.get("description") or "",
+                    *(item.get("tags") or ()),
+                )
+            ).lower(),
+        )
+        for item in items
+    ]
+
+
+def _caps_cache_lookup(key: _CapsKey) -> _CapsListing | None:
+    entry = _CAPS_CACHE.get(key)
+    if entry is not None and time.monotonic() - entry[0] < settings.CAPS_CACHE_TTL:
+        return entry[1], entry[2]
+    return None
+
+
+async def _cp_list_capabilities_indexed(
+    provider: str | None = None,
+    status: str | None = None,
+    *,
+    client: httpx.AsyncClient | None = None,
+) -> _CapsListing:
+    """Return a (briefly cached) capability listing with its search rows.
+
+    Concurrent misses for the same filter wait on a single upstream request.
+    The returned objects are shared between callers and must not be mutated.
+    """
+    key = (provider, status)
+    cached = _caps_cache_lookup(key)
+    if cached is not None:
+        return cached
+
+    async def fetch() -> _CapsListing:
+        data = await cp_list_capabilities(provider, status, client=client)
+        rows = _search_rows(data.get("items", []))
+        if not data.get("_stub"):
+            _CAPS_CACHE[key] = (time.monotonic(), data, rows)
+        return data, rows
+
+    return await _single_flight(_CAPS_INFLIGHT, key, fetch)
+
+
+async def cp_search_capabilities(
+    query: str,
+    *,
+    client: httpx.AsyncClient | None = None,
+) -> tuple[dict[str, Any], list[dict[str, Any]]]:
+    """Substring-match ``query`` against capability names, descriptions and tags.
+
+    Returns the underlying listing (for its stub markers) and the matches.
+    An empty or whitespace-only query matches everything without a scan.
+    """
+    data, rows = await _cp_list_capabilities_indexed(client=client)
+    if not query or query.isspace():
+        return data, list(data.get("items", []))
+    query_lower = query.lower()
+    return data, [item for item, haystack in rows if query_lower in haystack]
+
+
 # ---------------------------------------------------------------------------
 # Gateway
 # ---------------------------------------------------------------------------
@@ -113,6 +338,8 @@ async def gw_execute(
     tenant_id: str,
     idempotency_key: str | None = None,
     scope: str = "execute",
+    *,
+    client: httpx.AsyncClient | None = None,
 ) -> dict[str, Any]:
     payload: dict[str, Any] = {
         "params": params,
@@ -125,6 +352,7 @@ async def gw_execute(
     return await _post(
         f"{settings.GATEWAY_URL}/execute/{capability_id}",
         payload,
+        client=client,
         stub_response={
             "receipt_id": "stub-receipt",
             "capability_id": capability_id,
@@ -139,25 +367,136 @@ async def gw_execute(
     )
 
 
+def execution_layers(size: int, edges: Sequence[tuple[int, int]]) -> list[list[int]]:
+    """Group call indices ``0..size-1`` into dependency layers.
+
+    Each ``(src, dst)`` edge puts ``dst`` in a later layer than ``src``.
+    Raises :class:`ValueError` for out-of-range indices or cycles.
+    """
+    indegree = [0] * size
+    children: list[list[int]] = [[] for _ in range(size)]
+    for src, dst in edges:
+        if not (0 <= src < size and 0 <= dst < size):
+            raise ValueError(f"Edge ({src}, {dst}) references an unknown call")
+        children[src].append(dst)
+        indegree[dst] += 1
+
+    layers: list[list[int]] = []
+    layer = [i for i in range(size) if indegree[i] == 0]
+    placed = 0
+    while layer:
+        layers.append(layer)
+        placed += len(layer)
+        next_layer: list[int] = []
+        for i in layer:
+            for child in children[i]:
+                indegree[child] -= 1
+                if indegree[child] == 0:
+                    next_layer.append(child)
+        layer = next_layer
+    if placed != size:
+        raise ValueError("Call dependencies contain a cycle")
+    return layers
+
+
+async def gw_execute_batch(
+    calls: Sequence[Mapping[str, Any]],
+    edges: Sequence[tuple[int, int]],
+    tenant_id: str,
+    *,
+    client: httpx.AsyncClient | None = None,
+) -> dict[str, Any]:
+    """Execute dependent capability calls, one concurrent layer at a time.
+
+    For each ``(src, dst)`` edge, call ``dst`` receives the result of call
+    ``src`` as ``params["inputs"][str(src)]``. A call is skipped (status
+    ``skipped``) when any call it depends on did not succeed. Receipts are
+    returned in the same order as ``calls``. At most ``BATCH_MAX_CONCURRENCY``
+    gateway executions are in flight at once.
+    """
+    layers = execution_layers(len(calls), edges)
+    limit = asyncio.Semaphore(settings.BATCH_MAX_CONCURRENCY)
+    parents: list[list[int]] = [[] for _ in calls]
+    for src, dst in edges:
+        parents[dst].append(src)
+    receipts: list[dict[str, Any]] = [{} for _ in calls]
+
+    async def _execute(i: int) -> dict[str, Any]:
+        call = calls[i]
+        params = dict(call.get("params") or {})
+        if parents[i]:
+            failed = [p for p in parents[i] if receipts[p].get("status") != "success"]
+            if failed:
+                return {
+                    "capability_id": call["capability_id"],
+                    "status": "skipped",
+                    "error": f"Dependencies did not succeed: {failed}",
+                }
+            params["inputs"] = {str(p): receipts[p].get("result") for p in parents[i]}
+        async with limit:
+            return await gw_execute(
+                capability_id=call["capability_id"],
+                params=params,
+                tenant_id=tenant_id,
+                idempotency_key=call.get("idempotency_key"),
+                scope=call.get("scope", "execute"),
+                client=client,
+            )
+
+    for layer in layers:
+        results = await asyncio.gather(*(_execute(i) for i in layer))
+        for i, receipt in zip(layer, results, strict=True):
+            receipts[i] = receipt
+
+    return {"receipts": receipts, "total": len(receipts), "layers": len(layers)}
+
+
 # ---------------------------------------------------------------------------
 # Trust Plane
 # ---------------------------------------------------------------------------
 
 
-async def tp_get_stats(capability_id: str) -> dict[str, Any]:
-    url = f"{settings.TRUST_PLANE_URL}/capabilities/{capability_id}/stats"
-    return await _get(
-        url,
-        stub_response={
-            "capability_id": capability_id,
-            "success_rate_7d": 1.0,
-            "p95_latency_ms": 0.0,
-            "total_executions_7d": 0,
-            "last_checked": None,
-            "verified": False,
-            "_note": "Trust plane unreachable - returning stub stats",
-        },
-    )
+# capability_id -> (fetched_at, stats). Stats are rolling 7-day aggregates,
+# so back-to-back capabilities.stats / bounty.status calls can share a
+# response for TP_STATS_CACHE_TTL seconds. Stub responses are never cached.
+# Keys are caller-supplied, so the cache is capped at _TP_CACHE_MAX entries.
+_TP_CACHE: dict[str, tuple[float, dict[str, Any]]] = {}
+_TP_CACHE_MAX = 1024
+_TP_INFLIGHT: dict[str, asyncio.Future[dict[str, Any]]] = {}
+
+
+async def tp_get_stats(
+    capability_id: str,
+    *,
+    client: httpx.AsyncClient | None = None,
+) -> dict[str, Any]:
+    """Fetch trust plane stats, briefly cached and single-flighted per capability.
+
+    The returned dict is shared between callers and must not be mutated.
+    """
+    cached = _cache_get(_TP_CACHE, capability_id, settings.TP_STATS_CACHE_TTL)
+    if cached is not None:
+        return cached
+
+    async def fetch() -> dict[str, Any]:
+        data = await _get(
+            f"{settings.TRUST_PLANE_URL}/capabilities/{capability_id}/stats",
+            client=client,
+            stub_response={
+                "capability_id": capability_id,
+                "success_rate_7d": 1.0,
+                "p95_latency_ms": 0.0,
+                "total_executions_7d": 0,
+                "last_checked": None,
+                "verified": False,
+                "_note": "Trust plane unreachable - returning stub stats",
+            },
+        )
+        if not data.get("_stub"):
+            _cache_put(_TP_CACHE, capability_id, data, _TP_CACHE_MAX)
+        return data
+
+    return await _single_flight(_TP_INFLIGHT, capability_id, fetch)
 
 
 # ---------------------------------------------------------------------------
@@ -165,11 +504,44 @@ async def tp_get_stats(capability_id: str) -> dict[str, Any]:
 # ---------------------------------------------------------------------------
 
 # Platform API base URLs for bounty discovery
-PLATFORM_URLS: dict[str, str] = {
-    "algora": "https://console.algora.io/api/bounties",
-    "gitcoin": "https://gitcoin.co/api/v0.1/bounties/",
-    "polar": "https://api.polar.sh/v1/issues/search",
-    "github": "https://api.github.com/search/issues",
+_QueryParams = dict[str, str | int]
+
+
+def _algora_params(query: str, language: str | None, limit: int) -> _QueryParams:
+    return {"q": query, "limit": limit} if query else {"limit": limit}
+
+
+def _github_params(query: str, language: str | None, limit: int) -> _QueryParams:
+    terms = ["type:issue", "state:open", "label:bounty"]
+    if query:
+        terms.insert(0, query)
+    if language:
+        terms.append(f"language:{language}")
+    return {"q": " ".join(terms), "per_page": limit}
+
+
+def _gitcoin_params(query: str, language: str | None, limit: int) -> _QueryParams:
+    params: _QueryParams = {"is_open": "true", "limit": limit}
+    if query:
+        params["keyword"] = query
+    return params
+
+
+def _polar_params(query: str, language: str | None, limit: int) -> _QueryParams:
+    params: _QueryParams = {"have_badge": "true", "limit": limit}
+    if query:
+        params["q"] = query
+    return params
+
+
+# Platform -> (search URL, builder of its query string parameters), so a call
+# resolves both with one lookup. Parameters are URL-encoded by the caller, so
+# free-text queries may contain any character.
+_PLATFORMS: dict[str, tuple[str, Callable[[str, str | None, int], _QueryParams]]] = {
+    "algora": ("https://console.algora.io/api/bounties", _algora_params),
+    "gitcoin": ("https://gitcoin.co/api/v0.1/bounties/", _gitcoin_params),
+    "polar": ("https://api.polar.sh/v1/issues/search", _polar_params),
+    "github": ("https://api.github.com/search/issues", _github_params),
 }
 
 
@@ -179,64 +551,76 @@ async def gw_execute_bounty_discover(
     language: str | None = None,
     max_results: int = 20,
     tenant_id: str = "automaton",
+    *,
+    client: httpx.AsyncClient | None = None,
 ) -> dict[str, Any]:
     """Search bounty platforms via the http.proxy capability."""
-    base_url = PLATFORM_URLS.get(platform)
-    if not base_url:
+    search = _PLATFORMS.get(platform)
+    if search is None:
         return {
             "error": f"Unknown platform: {platform}",
-            "supported": list(PLATFORM_URLS.keys()),
+            "supported": list(_PLATFORMS),
         }
 
-    # Build platform-specific query URL
-    if platform == "algora":
-        url = f"{base_url}?limit={max_results}"
-        if query:
-            url = f"{base_url}?q={query}&limit={max_results}"
-    elif platform == "github":
-        q_parts = ["type:issue", "state:open", "label:bounty"]
-        if query:
-            q_parts.insert(0, query)
-        if language:
-            q_parts.append(f"language:{language}")
-        url = f"{base_url}?q={'+'.join(q_parts)}&per_page={max_results}"
-    elif platform == "gitcoin":
-        url = f"{base_url}?is_open=true&limit={max_results}"
-        if query:
-            url += f"&keyword={query}"
-    elif platform == "polar":
-        url = f"{base_url}?have_badge=true&limit={max_results}"
-        if query:
-            url += f"&q={query}"
-    else:
-        url = base_url
+    base_url, build_params = search
+    url = f"{base_url}?{urlencode(build_params(query, language, max_results))}"
 
     result = await gw_execute(
         capability_id="http.proxy",
         params={"url": url, "method": "GET"},
         tenant_id=tenant_id,
         scope="execute",
+        client=client,
     )
     return {"platform": platform, "query": query, "gateway_receipt": result}
 
 
+# (tenant_id, url) -> (fetched_at, receipt). bounty.status runs a triage and
+# agents usually follow up with bounty.triage on the same issue, so successful
+# receipts are reused for TRIAGE_CACHE_TTL seconds. Tenant and URL are both
+# client-controlled, so the cache is capped at _TRIAGE_CACHE_MAX entries.
+_TRIAGE_CACHE: dict[tuple[str, str], tuple[float, dict[str, Any]]] = {}
+_TRIAGE_CACHE_MAX = 1024
+_TRIAGE_INFLIGHT: dict[tuple[str, str], asyncio.Future[dict[str, Any]]] = {}
+
+
 async def gw_execute_gwi_triage(
     url: str,
     tenant_id: str = "automaton",
+    *,
+    client: httpx.AsyncClient | None = None,
 ) -> dict[str, Any]:
-    """Triage a GitHub issue via the gwi.triage capability."""
-    return await gw_execute(
-        capability_id="gwi.triage",
-        params={"url": url},
-        tenant_id=tenant_id,
-        scope="execute",
-    )
+    """Triage a GitHub issue via the gwi.triage capability.
+
+    Receipts are briefly cached and single-flighted per tenant and URL. The
+    returned dict is shared between callers and must not be mutated.
+    """
+    key = (tenant_id, url)
+    cached = _cache_get(_TRIAGE_CACHE, key, settings.TRIAGE_CACHE_TTL)
+    if cached is not None:
+        return cached
+
+    async def fetch() -> dict[str, Any]:
+        receipt = await gw_execute(
+            capability_id="gwi.triage",
+            params={"url": url},
+            tenant_id=tenant_id,
+            scope="execute",
+            client=client,
+        )
+        if receipt.get("status") == "success":
+            _cache_put(_TRIAGE_CACHE, key, receipt, _TRIAGE_CACHE_MAX)
+        return receipt
+
+    return await _single_flight(_TRIAGE_INFLIGHT, key, fetch)
 
 
 async def gw_execute_gwi_command(
     url: str,
     command: str = "issue-to-code",
     tenant_id: str = "automaton",
+    *,
+    client: httpx.AsyncClient | None = None,
 ) -> dict[str, Any]:
     """Execute a GWI command (issue-to-code or resolve) via the gateway."""
     cap_id = (
@@ -249,4 +633,5 @@ async def gw_execute_gwi_command(
         params={"url": url},
         tenant_id=tenant_id,
         scope="execute",
+        client=client,
     )
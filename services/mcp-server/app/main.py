@@ -28,21 +28,24 @@ Start with::
 from __future__ import annotations
 
 import logging
-import time
-import uuid
 from collections.abc import AsyncIterator
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, Request, Response
-from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.openapi.docs import get_redoc_html, get_swagger_ui_html
 from fastapi.responses import JSONResponse
+from moat_core.auth import AuthConfig, configure_auth
 from moat_core.logging import configure_logging
 from moat_core.security_headers import SecurityHeadersMiddleware
 
 from app.config import settings
+from app.http_client import create_client
+from app.middleware import REQUEST_ID, FastCORSMiddleware, RequestIDMiddleware
+from app.responses import GZIP_MINIMUM_SIZE, StaticJSON
 from app.routers.discovery import router as discovery_router
 from app.routers.tools import router as tools_router
-from app.tool_definitions import TOOL_SCHEMAS
+from app.tool_definitions import TOOLS_LISTING
 
 # Configure structured JSON logging before anything else writes to the log.
 configure_logging(level=settings.LOG_LEVEL, service_name=settings.SERVICE_NAME)
@@ -56,8 +59,6 @@ logger = logging.getLogger(__name__)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncIterator[None]:
-    from moat_core.auth import AuthConfig, configure_auth
-
     logger.info(
         "MCP Server starting",
         extra={
@@ -76,8 +77,14 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     configure_auth(auth_config, environment=settings.MOAT_ENV)
 
     logger.info("Auth configured", extra={"auth_disabled": settings.MOAT_AUTH_DISABLED})
-    yield
-    logger.info("MCP Server shutting down")
+
+    # One pooled upstream client for every router, for the app's lifetime.
+    app.state.http = create_client()
+    try:
+        yield
+    finally:
+        await app.state.http.aclose()
+        logger.info("MCP Server shutting down")
 
 
 # ---------------------------------------------------------------------------
@@ -94,6 +101,7 @@ app = FastAPI(
         "- `POST /tools/capabilities.list` - List capabilities\n"
         "- `POST /tools/capabilities.search` - Search by name/description\n"
         "- `POST /tools/capabilities.execute` - Execute a capability\n"
+        "- `POST /tools/capabilities.executeBatch` - Execute dependent capabilities\n"
         "- `POST /tools/capabilities.stats` - Get reliability stats\n"
         "- `POST /tools/bounty.discover` - Search bounty platforms\n"
         "- `POST /tools/bounty.triage` - Triage a GitHub issue via GWI\n"
@@ -104,9 +112,11 @@ app = FastAPI(
         "- `GET /.well-known/agent.json` - A2A discovery endpoint\n"
     ),
     version="0.1.0",
-    openapi_url="/openapi.json",  # Always available — agents need schema discovery
-    docs_url="/docs" if _expose_interactive else None,
-    redoc_url="/redoc" if _expose_interactive else None,
+    # /openapi.json (always available; agents need schema discovery), /docs and
+    # /redoc are mounted below, serving a schema encoded once.
+    openapi_url=None,
+    docs_url=None,
+    redoc_url=None,
     lifespan=lifespan,
 )
 
@@ -114,38 +124,16 @@ app = FastAPI(
 # Middleware
 # ---------------------------------------------------------------------------
 
-_origins = [o.strip() for o in settings.ALLOWED_ORIGINS.split(",") if o.strip()]
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=_origins,
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+_origins = frozenset(
+    o.strip() for o in settings.ALLOWED_ORIGINS.split(",") if o.strip()
 )
+app.add_middleware(FastCORSMiddleware, allow_origins=_origins)
 app.add_middleware(SecurityHeadersMiddleware)
+# Dynamic bodies (tool results) are compressed on the fly; static discovery
+# payloads are served pre-gzipped by StaticJSON and pass through untouched.
+app.add_middleware(GZipMiddleware, minimum_size=GZIP_MINIMUM_SIZE, compresslevel=6)
 
-
-@app.middleware("http")
-async def request_id_middleware(request: Request, call_next: object) -> Response:
-    request_id = request.headers.get("X-Request-ID") or str(uuid.uuid4())
-    request.state.request_id = request_id
-    start = time.monotonic()
-
-    response: Response = await call_next(request)  # type: ignore[arg-type]
-    duration_ms = (time.monotonic() - start) * 1000
-
-    response.headers["X-Request-ID"] = request_id
-    logger.info(
-        "Request",
-        extra={
-            "request_id": request_id,
-            "method": request.method,
-            "path": request.url.path,
-            "status_code": response.status_code,
-            "duration_ms": round(duration_ms, 2),
-        },
-    )
-    return response
+app.add_middleware(RequestIDMiddleware)
 
 
 # ---------------------------------------------------------------------------
@@ -155,7 +143,7 @@ async def request_id_middleware(request: Request, call_next: object) -> Response
 
 @app.exception_handler(Exception)
 async def unhandled_exception_handler(request: Request, exc: Exception) -> JSONResponse:
-    request_id = getattr(request.state, "request_id", "unknown")
+    request_id = REQUEST_ID.get()
     logger.error(
         "Unhandled exception",
         extra={"request_id": request_id, "error": str(exc)},
@@ -178,37 +166,61 @@ async def unhandled_exception_handler(request: Request, exc: Exception) -> JSONR
 app.include_router(discovery_router)
 app.include_router(tools_router)
 
+# FastAPI's built-in schema route re-encodes the cached schema dict on every
+# request. Agents hit it repeatedly during discovery, so the schema is encoded
+# once here, after every documented router is included, and served verbatim.
+_OPENAPI_URL = "/openapi.json"
+_OPENAPI = StaticJSON(app.openapi())
 
-@app.get("/healthz", tags=["ops"], summary="Health check")
-async def healthz() -> dict[str, str]:
-    return {"status": "ok", "service": settings.SERVICE_NAME}
 
-
-@app.get(
-    "/tools",
-    tags=["tools"],
-    summary="List available tools",
-)
-async def list_tools() -> dict[str, object]:
-    """Return a manifest of all available MCP tools and their descriptions."""
-    tools = []
-    for schema in TOOL_SCHEMAS:
-        tools.append(
-            {
-                "name": schema["name"],
-                "endpoint": f"POST /tools/{schema['name']}",
-                "description": schema["description"],
-                "input_schema": schema["input_schema"],
-            }
-        )
-    return {"tools": tools}
+# The endpoints below take no parameters and return static bodies, so they are
+# mounted as bare Starlette routes serving pre-encoded StaticJSON payloads. This skips
+# FastAPI's dependency solver, body parsing, and response-model coercion.
 
 
-@app.get("/", include_in_schema=False)
-async def root() -> dict[str, str]:
-    return {
+_HEALTHZ = StaticJSON({"status": "ok", "service": settings.SERVICE_NAME})
+_ROOT = StaticJSON(
+    {
         "service": settings.SERVICE_NAME,
         "version": "0.1.0",
         "docs": "/docs",
         "tools": "/tools",
     }
+)
+
+
+async def openapi_json(request: Request) -> Response:
+    return _OPENAPI.response(request)
+
+
+async def healthz(request: Request) -> Response:
+    return _HEALTHZ.response(request)
+
+
+async def list_tools(request: Request) -> Response:
+    """Return a manifest of all available MCP tools and their descriptions."""
+    return TOOLS_LISTING.response(request)
+
+
+async def root(request: Request) -> Response:
+    return _ROOT.response(request)
+
+
+app.router.add_route(_OPENAPI_URL, openapi_json, methods=["GET"])
+app.router.add_route("/healthz", healthz, methods=["GET"])
+app.router.add_route("/tools", list_tools, methods=["GET"])
+app.router.add_route("/", root, methods=["GET"])
+
+
+if _expose_interactive:
+
+    async def swagger_ui(request: Request) -> Response:
+        return get_swagger_ui_html(
+            openapi_url=_OPENAPI_URL, title=f"{app.title} - Swagger UI"
+        )
+
+    async def redoc(request: Request) -> Response:
+        return get_redoc_html(openapi_url=_OPENAPI_URL, title=f"{app.title} - ReDoc")
+
+    app.router.add_route("/docs", swagger_ui, methods=["GET"])
+    app.router.add_route("/redoc", redoc, methods=["GET"])
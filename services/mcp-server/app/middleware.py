@@ -0,0 +1,177 @@
+"""
+app.middleware
+~~~~~~~~~~~~~~
+MCP server middleware components.
+
+FastCORSMiddleware
+    Pure ASGI CORS handling for a fixed origin allow-list. Behaves like
+    Starlette's ``CORSMiddleware`` configured with ``allow_credentials=True``
+    and wildcard methods/headers, but all static header values are encoded
+    to bytes once at startup and written verbatim on each response.
+
+RequestIDMiddleware
+    Pure ASGI request tracing. Accepts an inbound ``X-Request-ID`` or
+    generates a UUID, exposes it via ``request.state.request_id`` and the
+    :data:`REQUEST_ID` context variable, echoes it in the response header,
+    and logs one line per request.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+import uuid
+from collections.abc import Collection
+from contextvars import ContextVar
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+# Current request's ID. Each request runs in its own task context, so the
+# value never leaks between requests and is deliberately not reset: the
+# Exception handler runs in Starlette's outermost ServerErrorMiddleware,
+# after RequestIDMiddleware has returned, and still needs to read it.
+REQUEST_ID: ContextVar[str] = ContextVar("request_id", default="unknown")
+
+_ALLOW_METHODS = b"DELETE, GET, HEAD, OPTIONS, PATCH, POST, PUT"
+_PREFLIGHT_VARY = (
+    b"Origin, Access-Control-Request-Method, Access-Control-Request-Headers"
+)
+
+
+class FastCORSMiddleware:
+    """Add CORS headers using precomputed byte values."""
+
+    def __init__(self, app: ASGIApp, allow_origins: Collection[str]) -> None:
+        self.app = app
+        self._allow_all_origins = "*" in allow_origins
+        self._allow_origins = frozenset(o.encode("latin-1") for o in allow_origins)
+        self._simple_headers: list[tuple[bytes, bytes]] = [
+            (b"access-control-allow-credentials", b"true"),
+        ]
+        self._preflight_headers: list[tuple[bytes, bytes]] = [
+            (b"vary", _PREFLIGHT_VARY),
+            (b"access-control-allow-methods", _ALLOW_METHODS),
+            (b"access-control-max-age", b"600"),
+            (b"access-control-allow-credentials", b"true"),
+            (b"content-type", b"text/plain; charset=utf-8"),
+        ]
+
+    def _is_allowed_origin(self, origin: bytes) -> bool:
+        return self._allow_all_origins or origin in self._allow_origins
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        origin: bytes | None = None
+        request_method: bytes | None = None
+        request_headers: bytes | None = None
+        for name, value in scope["headers"]:
+            if name == b"origin":
+                origin = value
+            elif name == b"access-control-request-method":
+                request_method = value
+            elif name == b"access-control-request-headers":
+                request_headers = value
+
+        if (
+            origin is not None
+            and request_method is not None
+            and scope["method"] == "OPTIONS"
+        ):
+            await self._preflight(origin, request_headers, send)
+            return
+
+        allowed = origin is not None and self._is_allowed_origin(origin)
+
+        async def send_with_cors(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = message["headers"] = list(message.get("headers", ()))
+                if origin is not None:
+                    headers.extend(self._simple_headers)
+                    if allowed:
+                        # Credentials are allowed, so the origin must be
+                        # echoed back rather than answered with "*".
+                        headers.append((b"access-control-allow-origin", origin))
+                headers.append((b"vary", b"Origin"))
+            await send(message)
+
+        await self.app(scope, receive, send_with_cors)
+
+    async def _preflight(
+        self, origin: bytes, request_headers: bytes | None, send: Send
+    ) -> None:
+        headers = list(self._preflight_headers)
+        if self._is_allowed_origin(origin):
+            status_code, body = 200, b"OK"
+            headers.append((b"access-control-allow-origin", origin))
+        else:
+            status_code, body = 400, b"Disallowed CORS origin"
+        if request_headers is not None:
+            # All headers are allowed, so mirror back whatever was requested.
+            headers.append((b"access-control-allow-headers", request_headers))
+        headers.append((b"content-length", str(len(body)).encode("latin-1")))
+
+        await send(
+            {"type": "http.response.start", "status": status_code, "headers": headers}
+        )
+        await send({"type": "http.response.body", "body": body})
+
+
+class RequestIDMiddleware:
+    """Attach a request ID to every HTTP request and log its outcome.
+
+    Written as a plain ASGI callable rather than ``@app.middleware("http")``
+    to avoid BaseHTTPMiddleware's per-request task group and memory streams.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        raw_id = b""
+        for name, value in scope["headers"]:
+            if name == b"x-request-id":
+                raw_id = value
+                break
+        if raw_id:
+            request_id = raw_id.decode("latin-1")
+        else:
+            request_id = str(uuid.uuid4())
+            raw_id = request_id.encode("latin-1")
+
+        scope.setdefault("state", {})["request_id"] = request_id
+        REQUEST_ID.set(request_id)
+        status_code = 500
+        start = time.monotonic_ns()
+
+        async def send_with_request_id(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = message["headers"] = list(message.get("headers", ()))
+                headers.append((b"x-request-id", raw_id))
+            await send(message)
+
+        await self.app(scope, receive, send_with_request_id)
+
+        # Skip building the extra dict entirely when INFO is disabled (prod).
+        if logger.isEnabledFor(logging.INFO):
+            duration_ms = (time.monotonic_ns() - start) / 1_000_000
+            logger.info(
+                "Request",
+                extra={
+                    "request_id": request_id,
+                    "method": scope["method"],
+                    "path": scope["path"],
+                    "status_code": status_code,
+                    "duration_ms": round(duration_ms, 2),
+                },
+            )
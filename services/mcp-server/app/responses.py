@@ -0,0 +1,110 @@
+"""
+app.responses
+~~~~~~~~~~~~~
+Pre-encoded JSON bodies for static MCP server responses.
+
+Discovery payloads (AgentCards, the tool manifest, the OpenAPI schema) never
+change at runtime. :class:`StaticJSON` encodes such a payload once, keeps a
+gzip-compressed copy alongside it, and hands out whichever variant the client
+accepts — so serving it costs no JSON encoding and no per-request compression.
+
+Each payload also carries an ETag derived from its encoded bytes, so clients
+that poll discovery endpoints can revalidate with ``If-None-Match`` and get a
+bodiless 304.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+from collections.abc import Mapping
+from types import MappingProxyType
+from typing import Any
+
+from starlette.requests import Request
+from starlette.responses import Response
+
+# Bodies smaller than this are not worth compressing (matches GZipMiddleware).
+GZIP_MINIMUM_SIZE = 1024
+
+
+def freeze(obj: Any) -> Any:
+    """Recursively convert dicts to read-only mappings and lists to tuples."""
+    if isinstance(obj, dict):
+        return MappingProxyType({k: freeze(v) for k, v in obj.items()})
+    if isinstance(obj, list):
+        return tuple(freeze(v) for v in obj)
+    return obj
+
+
+def thaw(obj: Any) -> Any:
+    """Return a mutable deep copy of a structure built by :func:`freeze`."""
+    if isinstance(obj, Mapping):
+        return {k: thaw(v) for k, v in obj.items()}
+    if isinstance(obj, tuple):
+        return [thaw(v) for v in obj]
+    return obj
+
+
+def json_bytes(obj: Any) -> bytes:
+    """Encode ``obj`` to compact UTF-8 JSON bytes.
+
+    Read-only mappings (frozen AgentCards) are encoded as JSON objects.
+    """
+    return json.dumps(
+        obj, ensure_ascii=False, separators=(",", ":"), default=dict
+    ).encode("utf-8")
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """Evaluate an ``If-None-Match`` header using weak comparison."""
+    if if_none_match == etag:
+        return True
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag[2:]:
+            return True
+    return False
+
+
+class StaticJSON:
+    """A JSON payload encoded once, with an optional pre-gzipped variant."""
+
+    __slots__ = ("body", "etag", "gzipped")
+
+    def __init__(self, obj: Any) -> None:
+        self.body = json_bytes(obj)
+        # Weak, because the identity and gzip variants share one validator.
+        digest = hashlib.blake2b(self.body, digest_size=16).hexdigest()
+        self.etag = f'W/"{digest}"'
+        self.gzipped = (
+            gzip.compress(self.body, compresslevel=6)
+            if len(self.body) >= GZIP_MINIMUM_SIZE
+            else None
+        )
+
+    def response(self, request: Request) -> Response:
+        """Return the encoded payload, gzipped if the client accepts it.
+
+        Answers 304 Not Modified when ``If-None-Match`` matches :attr:`etag`.
+        ``Cache-Control: no-cache`` lets clients keep the body and revalidate
+        it; SecurityHeadersMiddleware only adds its ``no-store`` default when
+        no Cache-Control is set.
+        """
+        headers = {"ETag": self.etag, "Cache-Control": "no-cache"}
+        if self.gzipped is not None:
+            headers["Vary"] = "Accept-Encoding"
+
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and _etag_matches(if_none_match, self.etag):
+            return Response(status_code=304, headers=headers)
+
+        if self.gzipped is not None and "gzip" in request.headers.get(
+            "accept-encoding", ""
+        ):
+            headers["Content-Encoding"] = "gzip"
+            return Response(
+                self.gzipped, media_type="application/json", headers=headers
+            )
+        return Response(self.body, media_type="application/json", headers=headers)
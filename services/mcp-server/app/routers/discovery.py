@@ -12,21 +12,26 @@ Implements:
 from __future__ import annotations
 
 import logging
+from collections.abc import Mapping
+from functools import lru_cache
+from types import MappingProxyType
 from typing import Any
 
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, HTTPException, Request, Response, status
 
 from app.config import settings
+from app.responses import StaticJSON, freeze
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(tags=["discovery"])
 
+
 # ---------------------------------------------------------------------------
 # AgentCard definitions for Moat services
 # ---------------------------------------------------------------------------
 
-_MCP_SERVER_CARD: dict[str, Any] = {
+_MCP_SERVER_CARD: Mapping[str, Any] = {
     "name": "moat-mcp-server",
     "description": (
         "Agent-facing tool surface for the Moat "
@@ -137,7 +142,7 @@ _MCP_SERVER_CARD: dict[str, Any] = {
     ],
 }
 
-_GATEWAY_CARD: dict[str, Any] = {
+_GATEWAY_CARD: Mapping[str, Any] = {
     "name": "moat-gateway",
     "description": (
         "Execution choke-point: policy evaluation, idempotency, adapter dispatch, "
@@ -161,7 +166,7 @@ _GATEWAY_CARD: dict[str, Any] = {
     ],
 }
 
-_CONTROL_PLANE_CARD: dict[str, Any] = {
+_CONTROL_PLANE_CARD: Mapping[str, Any] = {
     "name": "moat-control-plane",
     "description": "Capability registry, tenant connections, and vault abstraction.",
     "url": settings.CONTROL_PLANE_URL,
@@ -182,7 +187,7 @@ _CONTROL_PLANE_CARD: dict[str, Any] = {
     ],
 }
 
-_TRUST_PLANE_CARD: dict[str, Any] = {
+_TRUST_PLANE_CARD: Mapping[str, Any] = {
     "name": "moat-trust-plane",
     "description": "Reliability scoring, outcome event ingestion, and SLO tracking.",
     "url": settings.TRUST_PLANE_URL,
@@ -203,32 +208,107 @@ _TRUST_PLANE_CARD: dict[str, Any] = {
     ],
 }
 
+# Cards are returned verbatim from handlers, so freeze them to guarantee
+# nothing downstream can mutate module state.
+_MCP_SERVER_CARD = freeze(_MCP_SERVER_CARD)
+_GATEWAY_CARD = freeze(_GATEWAY_CARD)
+_CONTROL_PLANE_CARD = freeze(_CONTROL_PLANE_CARD)
+_TRUST_PLANE_CARD = freeze(_TRUST_PLANE_CARD)
+
 # Agent registry — keyed by name for lookup
-AGENT_CARDS: dict[str, dict[str, Any]] = {
-    "moat-mcp-server": _MCP_SERVER_CARD,
-    "moat-gateway": _GATEWAY_CARD,
-    "moat-control-plane": _CONTROL_PLANE_CARD,
-    "moat-trust-plane": _TRUST_PLANE_CARD,
+AGENT_CARDS: Mapping[str, Mapping[str, Any]] = MappingProxyType(
+    {
+        "moat-mcp-server": _MCP_SERVER_CARD,
+        "moat-gateway": _GATEWAY_CARD,
+        "moat-control-plane": _CONTROL_PLANE_CARD,
+        "moat-trust-plane": _TRUST_PLANE_CARD,
+    }
+)
+
+# The registry is read-only, so its derived views are built once here and
+# never need invalidating.
+ALL_AGENTS: tuple[Mapping[str, Any], ...] = tuple(AGENT_CARDS.values())
+
+
+def _build_skill_tag_index() -> dict[str, frozenset[str]]:
+    index: dict[str, set[str]] = {}
+    for name, card in AGENT_CARDS.items():
+        for skill in card.get("skills", ()):
+            for tag in skill.get("tags", ()):
+                index.setdefault(tag.lower(), set()).add(name)
+    return {tag: frozenset(names) for tag, names in index.items()}
+
+
+# Lowercased skill tag -> names of the agents advertising it.
+SKILL_TAG_INDEX: Mapping[str, frozenset[str]] = MappingProxyType(
+    _build_skill_tag_index()
+)
+
+
+@lru_cache(maxsize=256)
+def _scan_agents(tag_lower: str) -> tuple[Mapping[str, Any], ...]:
+    names: set[str] = set()
+    for tag, agent_names in SKILL_TAG_INDEX.items():
+        if tag_lower in tag:
+            names |= agent_names
+    return tuple(card for name, card in AGENT_CARDS.items() if name in names)
+
+
+# Lowercased skill tag -> matching agents, precomputed for every advertised
+# tag so the common case (filtering by a real tag) is a single dict lookup.
+AGENTS_BY_TAG: Mapping[str, tuple[Mapping[str, Any], ...]] = MappingProxyType(
+    {tag: _scan_agents(tag) for tag in SKILL_TAG_INDEX}
+)
+_scan_agents.cache_clear()
+
+
+def agents_matching(skill_tag: str) -> tuple[Mapping[str, Any], ...]:
+    """Return the agents with a skill tag containing ``skill_tag``.
+
+    Matching is a case-insensitive substring test against the distinct tags
+    in :data:`SKILL_TAG_INDEX`, and results keep :data:`AGENT_CARDS` order.
+    Whole tags are answered from :data:`AGENTS_BY_TAG`; other substrings fall
+    back to a cached scan of the tag index.
+    """
+    tag_lower = skill_tag.lower()
+    agents = AGENTS_BY_TAG.get(tag_lower)
+    return agents if agents is not None else _scan_agents(tag_lower)
+
+
+# Cards never change at runtime, so encode each response body once at import
+# and return it directly, bypassing jsonable_encoder on every request.
+_CARD_BODIES: dict[str, StaticJSON] = {
+    name: StaticJSON(card) for name, card in AGENT_CARDS.items()
+}
+_ALL_AGENTS_BODY = StaticJSON({"agents": ALL_AGENTS, "total": len(ALL_AGENTS)})
+_TAG_BODIES: dict[str, StaticJSON] = {
+    tag: StaticJSON({"agents": agents, "total": len(agents)})
+    for tag, agents in AGENTS_BY_TAG.items()
 }
 
 
+@lru_cache(maxsize=256)
+def _matching_agents_body(tag_lower: str) -> StaticJSON:
+    agents = _scan_agents(tag_lower)
+    return StaticJSON({"agents": agents, "total": len(agents)})
+
+
 # ---------------------------------------------------------------------------
 # Routes
 # ---------------------------------------------------------------------------
 
 
-@router.get(
-    "/.well-known/agent.json",
-    summary="A2A AgentCard discovery",
-    response_model=None,
-)
-async def well_known_agent_card() -> dict[str, Any]:
+async def well_known_agent_card(request: Request) -> Response:
     """Return the A2A v0.3.0 AgentCard for this MCP server.
 
     Standard endpoint per the Agent-to-Agent protocol specification.
-    Other agents fetch this to discover skills and capabilities.
+    Other agents fetch this to discover skills and capabilities. Mounted as
+    a bare Starlette route: it takes no parameters and serves static bytes.
     """
-    return _MCP_SERVER_CARD
+    return _CARD_BODIES["moat-mcp-server"].response(request)
+
+
+router.add_route("/.well-known/agent.json", well_known_agent_card, methods=["GET"])
 
 
 @router.get(
@@ -237,38 +317,31 @@ async def well_known_agent_card() -> dict[str, Any]:
     response_model=None,
 )
 async def list_agents(
+    request: Request,
     skill_tag: str | None = None,
-) -> dict[str, Any]:
+) -> Response:
     """List all known agents in the Moat ecosystem.
 
     Optionally filter by skill tag (e.g. ``?skill_tag=execute``).
     """
-    agents = list(AGENT_CARDS.values())
-
-    if skill_tag:
-        tag_lower = skill_tag.lower()
-        agents = [
-            agent
-            for agent in agents
-            if any(
-                tag_lower in tag
-                for skill in agent.get("skills", [])
-                for tag in skill.get("tags", [])
-            )
-        ]
+    if not skill_tag:
+        return _ALL_AGENTS_BODY.response(request)
 
-    return {"agents": agents, "total": len(agents)}
+    tag_lower = skill_tag.lower()
+    body = _TAG_BODIES.get(tag_lower) or _matching_agents_body(tag_lower)
+    return body.response(request)
 
 
 @router.get(
     "/agents/{agent_name}",
     summary="Get a specific agent's card",
     response_model=None,
+    include_in_schema=False,
 )
-async def get_agent_card(agent_name: str) -> dict[str, Any]:
+async def get_agent_card(agent_name: str, request: Request) -> Response:
     """Return the AgentCard for a specific agent by name."""
-    card = AGENT_CARDS.get(agent_name)
-    if card is None:
+    body = _CARD_BODIES.get(agent_name)
+    if body is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=(
@@ -276,4 +349,4 @@ async def get_agent_card(agent_name: str) -> dict[str, Any]:
                 f"Known agents: {list(AGENT_CARDS.keys())}"
             ),
         )
-    return card
+    return body.response(request)
@@ -35,45 +35,73 @@ and respond independently of the other services.
 
 from __future__ import annotations
 
+import asyncio
 import logging
-import uuid
+from collections.abc import Mapping
 from typing import Annotated, Any
 
+import httpx
 from fastapi import APIRouter, Depends, HTTPException, Request, status
 from moat_core.auth import get_current_tenant
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, field_serializer
+from pydantic_core import to_jsonable_python
 
 from app.http_client import (
     cp_list_capabilities,
+    cp_search_capabilities,
+    get_http_client,
     gw_execute,
+    gw_execute_batch,
     gw_execute_bounty_discover,
     gw_execute_gwi_command,
     gw_execute_gwi_triage,
     tp_get_stats,
 )
-from app.routers.discovery import AGENT_CARDS
+from app.routers.discovery import AGENT_CARDS, ALL_AGENTS, agents_matching
+from app.tool_definitions import MAX_BATCH_CALLS
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/tools", tags=["tools"])
 
+HttpClient = Annotated[httpx.AsyncClient, Depends(get_http_client)]
+
 
 # ---------------------------------------------------------------------------
 # Shared response envelope
 # ---------------------------------------------------------------------------
 
 
-class ToolResponse(BaseModel):
+class _ToolModel(BaseModel):
+    """Base for tool request and response models.
+
+    Instances are never modified after validation, so they are frozen.
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+
+class ToolResponse(_ToolModel):
     """Standard MCP tool response envelope."""
 
     tool: str
     result: dict[str, Any]
     request_id: str
 
+    @field_serializer("result", when_used="json")
+    def _serialize_result(self, result: dict[str, Any]) -> Any:
+        # Agent cards are shared read-only mappings; unwrap them for JSON.
+        return to_jsonable_python(result, fallback=dict)
+
+
+def _ok_or_err(outcome: Any) -> Any:
+    """Turn an exception returned by ``gather`` into an ``{"error": ...}`` dict."""
+    return {"error": str(outcome)} if isinstance(outcome, Exception) else outcome
 
-def _response(tool: str, result: dict[str, Any], request: Request) -> ToolResponse:
-    request_id = getattr(request.state, "request_id", str(uuid.uuid4()))
-    return ToolResponse(tool=tool, result=result, request_id=request_id)
+
+def _response(tool: str, result: Mapping[str, Any], request: Request) -> ToolResponse:
+    # Always set by RequestIDMiddleware, which wraps every route.
+    return ToolResponse(tool=tool, result=result, request_id=request.state.request_id)
 
 
 # ---------------------------------------------------------------------------
@@ -81,13 +109,13 @@ def _response(tool: str, result: dict[str, Any], request: Request) -> ToolRespon
 # ---------------------------------------------------------------------------
 
 
-class ListFilter(BaseModel):
+class ListFilter(_ToolModel):
     provider: str | None = None
     status: str | None = None
     verified: bool | None = None
 
 
-class CapabilitiesListRequest(BaseModel):
+class CapabilitiesListRequest(_ToolModel):
     filter: ListFilter = Field(default_factory=ListFilter)
 
 
@@ -100,6 +128,7 @@ async def tool_capabilities_list(
     body: CapabilitiesListRequest,
     request: Request,
     tenant_id: Annotated[str, Depends(get_current_tenant)],
+    http: HttpClient,
 ) -> ToolResponse:
     """List capabilities from the control plane registry.
 
@@ -121,15 +150,10 @@ async def tool_capabilities_list(
     data = await cp_list_capabilities(
         provider=body.filter.provider,
         status=body.filter.status,
+        verified=body.filter.verified,
+        client=http,
     )
 
-    # Apply verified filter locally (trust plane data not merged here for MVP)
-    items = data.get("items", [])
-    if body.filter.verified is not None:
-        # For MVP, filter only if items have verified field; otherwise pass through
-        items = [item for item in items if item.get("verified") == body.filter.verified]
-        data = {**data, "items": items, "total": len(items)}
-
     logger.info(
         "Tool: capabilities.list",
         extra={"filter": body.filter.model_dump(), "returned": data.get("total", 0)},
@@ -142,7 +166,7 @@ async def tool_capabilities_list(
 # ---------------------------------------------------------------------------
 
 
-class CapabilitiesSearchRequest(BaseModel):
+class CapabilitiesSearchRequest(_ToolModel):
     query: str = Field(..., min_length=1, description="Search query string")
 
 
@@ -155,6 +179,7 @@ async def tool_capabilities_search(
     body: CapabilitiesSearchRequest,
     request: Request,
     tenant_id: Annotated[str, Depends(get_current_tenant)],
+    http: HttpClient,
 ) -> ToolResponse:
     """Search capabilities using substring matching on name and description.
 
@@ -170,18 +195,8 @@ async def tool_capabilities_search(
     Note: This is a simple substring match for MVP. Replace with full-text
     search (Elasticsearch, pgvector, or Vertex AI Search) for production.
     """
-    # Fetch all capabilities then filter in-process for MVP
-    data = await cp_list_capabilities()
-    items = data.get("items", [])
-
-    query_lower = body.query.lower()
-    matches = [
-        item
-        for item in items
-        if query_lower in item.get("name", "").lower()
-        or query_lower in item.get("description", "").lower()
-        or any(query_lower in tag for tag in item.get("tags", []))
-    ]
+    # Match against a briefly cached, pre-lowercased listing for MVP
+    data, matches = await cp_search_capabilities(body.query, client=http)
 
     result = {"items": matches, "total": len(matches), "query": body.query}
     if data.get("_stub"):
@@ -200,7 +215,7 @@ async def tool_capabilities_search(
 # ---------------------------------------------------------------------------
 
 
-class CapabilitiesExecuteRequest(BaseModel):
+class CapabilitiesExecuteRequest(_ToolModel):
     capability_id: str = Field(..., description="ID of the capability to execute")
     params: dict[str, Any] = Field(
         default_factory=dict,
@@ -223,6 +238,7 @@ async def tool_capabilities_execute(
     body: CapabilitiesExecuteRequest,
     request: Request,
     auth_tenant_id: Annotated[str, Depends(get_current_tenant)],
+    http: HttpClient,
 ) -> ToolResponse:
     """Execute a capability through the Moat gateway pipeline.
 
@@ -257,6 +273,7 @@ async def tool_capabilities_execute(
         tenant_id=body.tenant_id,
         idempotency_key=body.idempotency_key,
         scope=body.scope,
+        client=http,
     )
 
     logger.info(
@@ -271,12 +288,100 @@ async def tool_capabilities_execute(
     return _response("capabilities.execute", result, request)
 
 
+# ---------------------------------------------------------------------------
+# capabilities.executeBatch
+# ---------------------------------------------------------------------------
+
+
+class BatchCall(_ToolModel):
+    capability_id: str = Field(..., description="ID of the capability to execute")
+    params: dict[str, Any] = Field(
+        default_factory=dict,
+        description="Input parameters for the capability",
+    )
+    idempotency_key: str | None = Field(
+        default=None,
+        description="Optional idempotency key for safe retries",
+    )
+    scope: str = Field(default="execute", description="Permission scope")
+
+
+class CapabilitiesExecuteBatchRequest(_ToolModel):
+    calls: list[BatchCall] = Field(..., min_length=1, max_length=MAX_BATCH_CALLS)
+    edges: list[tuple[int, int]] = Field(
+        default_factory=list,
+        description="(src, dst) pairs: call dst runs after, and receives, call src",
+    )
+    tenant_id: str = Field(..., description="Tenant making the request")
+
+
+@router.post(
+    "/capabilities.executeBatch",
+    response_model=ToolResponse,
+    summary="Execute several dependent capabilities in one call",
+)
+async def tool_capabilities_execute_batch(
+    body: CapabilitiesExecuteBatchRequest,
+    request: Request,
+    auth_tenant_id: Annotated[str, Depends(get_current_tenant)],
+    http: HttpClient,
+) -> ToolResponse:
+    """Execute a dependency graph of capabilities with one agent round trip.
+
+    **MCP Tool:** ``capabilities.executeBatch``
+
+    **Input:**
+    ```json
+    {
+        "calls": [
+            {"capability_id": "gwi.triage", "params": {"url": "..."}},
+            {"capability_id": "gwi.issue-to-code", "params": {"url": "..."}}
+        ],
+        "edges": [[0, 1]],
+        "tenant_id": "tenant-xyz"
+    }
+    ```
+
+    **Output:** One receipt per call, in request order. Calls are grouped
+    into dependency layers; each layer runs concurrently and call ``dst``
+    receives call ``src``'s result as ``params.inputs["<src>"]``.
+    """
+    if body.tenant_id != auth_tenant_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Tenant ID in request body does not match authenticated tenant",
+        )
+
+    try:
+        result = await gw_execute_batch(
+            [call.model_dump() for call in body.calls],
+            body.edges,
+            body.tenant_id,
+            client=http,
+        )
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(exc),
+        ) from exc
+
+    logger.info(
+        "Tool: capabilities.executeBatch",
+        extra={
+            "tenant_id": body.tenant_id,
+            "calls": result["total"],
+            "layers": result["layers"],
+        },
+    )
+    return _response("capabilities.executeBatch", result, request)
+
+
 # ---------------------------------------------------------------------------
 # capabilities.stats
 # ---------------------------------------------------------------------------
 
 
-class CapabilitiesStatsRequest(BaseModel):
+class CapabilitiesStatsRequest(_ToolModel):
     capability_id: str = Field(
         ..., description="ID of the capability to retrieve stats for"
     )
@@ -291,6 +396,7 @@ async def tool_capabilities_stats(
     body: CapabilitiesStatsRequest,
     request: Request,
     tenant_id: Annotated[str, Depends(get_current_tenant)],
+    http: HttpClient,
 ) -> ToolResponse:
     """Retrieve rolling 7-day reliability statistics from the trust plane.
 
@@ -304,7 +410,7 @@ async def tool_capabilities_stats(
     **Output:** Reliability stats including success rate, p95 latency,
     verification status, and trust signals (should_hide, should_throttle).
     """
-    result = await tp_get_stats(body.capability_id)
+    result = await tp_get_stats(body.capability_id, client=http)
 
     logger.info(
         "Tool: capabilities.stats",
@@ -322,7 +428,7 @@ async def tool_capabilities_stats(
 # ---------------------------------------------------------------------------
 
 
-class BountyDiscoverRequest(BaseModel):
+class BountyDiscoverRequest(_ToolModel):
     platform: str = Field(default="algora", description="Bounty platform to search")
     query: str = Field(default="", description="Search query")
     language: str | None = Field(
@@ -343,6 +449,7 @@ async def tool_bounty_discover(
     body: BountyDiscoverRequest,
     request: Request,
     tenant_id: Annotated[str, Depends(get_current_tenant)],
+    http: HttpClient,
 ) -> ToolResponse:
     """Search bounty platforms (Algora, Gitcoin, Polar, GitHub) for funded bounties."""
     result = await gw_execute_bounty_discover(
@@ -351,6 +458,7 @@ async def tool_bounty_discover(
         language=body.language,
         max_results=body.max_results,
         tenant_id=tenant_id,
+        client=http,
     )
     logger.info(
         "Tool: bounty.discover",
@@ -364,7 +472,7 @@ async def tool_bounty_discover(
 # ---------------------------------------------------------------------------
 
 
-class BountyTriageRequest(BaseModel):
+class BountyTriageRequest(_ToolModel):
     url: str = Field(..., description="GitHub issue or PR URL")
 
 
@@ -377,12 +485,13 @@ async def tool_bounty_triage(
     body: BountyTriageRequest,
     request: Request,
     tenant_id: Annotated[str, Depends(get_current_tenant)],
+    http: HttpClient,
 ) -> ToolResponse:
     """Triage a GitHub issue using GWI triage.
 
     Returns complexity score and assessment.
     """
-    result = await gw_execute_gwi_triage(url=body.url, tenant_id=tenant_id)
+    result = await gw_execute_gwi_triage(url=body.url, tenant_id=tenant_id, client=http)
     logger.info(
         "Tool: bounty.triage",
         extra={"url": body.url},
@@ -399,7 +508,7 @@ async def tool_bounty_triage(
 # ---------------------------------------------------------------------------
 
 
-class BountyExecuteRequest(BaseModel):
+class BountyExecuteRequest(_ToolModel):
     url: str = Field(..., description="GitHub issue URL to fix")
     command: str = Field(
         default="issue-to-code",
@@ -416,12 +525,14 @@ async def tool_bounty_execute(
     body: BountyExecuteRequest,
     request: Request,
     tenant_id: Annotated[str, Depends(get_current_tenant)],
+    http: HttpClient,
 ) -> ToolResponse:
     """Execute a GitHub issue fix using GWI issue-to-code or resolve."""
     result = await gw_execute_gwi_command(
         url=body.url,
         command=body.command,
         tenant_id=tenant_id,
+        client=http,
     )
     logger.info(
         "Tool: bounty.execute",
@@ -439,7 +550,7 @@ async def tool_bounty_execute(
 # ---------------------------------------------------------------------------
 
 
-class BountyStatusRequest(BaseModel):
+class BountyStatusRequest(_ToolModel):
     url: str = Field(..., description="GitHub issue URL to check status for")
     capability_id: str = Field(
         default="gwi.triage", description="Capability ID for stats"
@@ -455,27 +566,19 @@ async def tool_bounty_status(
     body: BountyStatusRequest,
     request: Request,
     tenant_id: Annotated[str, Depends(get_current_tenant)],
+    http: HttpClient,
 ) -> ToolResponse:
     """Check bounty execution status: triage score + trust stats + IRSB receipt."""
-    import asyncio
-
-    stats_task = asyncio.create_task(tp_get_stats(body.capability_id))
-    triage_task = asyncio.create_task(
-        gw_execute_gwi_triage(url=body.url, tenant_id=tenant_id)
-    )
-
     stats, triage = await asyncio.gather(
-        stats_task, triage_task, return_exceptions=True
+        tp_get_stats(body.capability_id, client=http),
+        gw_execute_gwi_triage(url=body.url, tenant_id=tenant_id, client=http),
+        return_exceptions=True,
     )
 
     result = {
         "url": body.url,
-        "trust_stats": stats
-        if not isinstance(stats, Exception)
-        else {"error": str(stats)},
-        "triage_result": triage
-        if not isinstance(triage, Exception)
-        else {"error": str(triage)},
+        "trust_stats": _ok_or_err(stats),
+        "triage_result": _ok_or_err(triage),
     }
     logger.info(
         "Tool: bounty.status",
@@ -489,7 +592,7 @@ async def tool_bounty_status(
 # ---------------------------------------------------------------------------
 
 
-class AgentsDiscoverRequest(BaseModel):
+class AgentsDiscoverRequest(_ToolModel):
     skill_tag: str | None = Field(default=None, description="Filter by skill tag")
 
 
@@ -509,19 +612,7 @@ async def tool_agents_discover(
 
     Optionally filter by skill tag to find agents with specific capabilities.
     """
-    agents = list(AGENT_CARDS.values())
-
-    if body.skill_tag:
-        tag_lower = body.skill_tag.lower()
-        agents = [
-            agent
-            for agent in agents
-            if any(
-                tag_lower in tag
-                for skill in agent.get("skills", [])
-                for tag in skill.get("tags", [])
-            )
-        ]
+    agents = agents_matching(body.skill_tag) if body.skill_tag else ALL_AGENTS
 
     result = {"agents": agents, "total": len(agents)}
     logger.info(
@@ -536,7 +627,7 @@ async def tool_agents_discover(
 # ---------------------------------------------------------------------------
 
 
-class AgentsCardRequest(BaseModel):
+class AgentsCardRequest(_ToolModel):
     agent_name: str = Field(..., description="Agent name to look up")
 
 
@@ -8,6 +8,11 @@ uvicorn invocation::
 
     moat-mcp-rest              # from installed entry point
     python -m app.serve        # direct invocation
+
+Serves with ``WORKERS`` processes (default: 1). In-process caches
+(capability listings, trust stats, triage receipts) and the upstream
+connection pool are per worker and not shared, so each extra worker warms
+its own copies.
 """
 
 from __future__ import annotations
@@ -24,6 +29,12 @@ def main() -> None:
         host=settings.HOST,
         port=settings.PORT,
         log_level=settings.LOG_LEVEL.lower(),
+        workers=settings.WORKERS,
+        # uvicorn[standard] ships uvloop and httptools; fail loudly if they
+        # are missing rather than silently falling back to the slow paths.
+        loop="uvloop",
+        http="httptools",
+        proxy_headers=True,
     )
 
 
@@ -3,7 +3,7 @@ app.stdio_server
 ~~~~~~~~~~~~~~~~
 MCP SDK stdio transport for the Moat MCP Server.
 
-Exposes all 8 Moat tools (4 core + 4 scout-workflow) via the Model Context
+Exposes all 11 Moat tools (5 core + 4 scout-workflow + 2 A2A) via the Model Context
 Protocol stdio transport. This is the primary integration path for Claude
 Desktop, Claude Code, and other MCP-native AI agents.
 
@@ -37,19 +37,32 @@ Claude Desktop / Claude Code config::
 from __future__ import annotations
 
 import asyncio
-import json
 import logging
+from collections.abc import Awaitable, Callable, Mapping
 from typing import Any
 
+import httpx
+import orjson
+from jsonschema.exceptions import best_match
+from jsonschema.protocols import Validator
 from mcp.server import Server
-from mcp.types import TextContent, Tool
+from mcp.types import CallToolResult, TextContent, Tool
 
+from app.config import settings
 from app.http_client import (
     cp_list_capabilities,
+    cp_search_capabilities,
+    create_client,
     gw_execute,
+    gw_execute_batch,
+    gw_execute_bounty_discover,
+    gw_execute_gwi_triage,
     tp_get_stats,
 )
-from app.tool_definitions import TOOL_SCHEMAS
+from app.responses import thaw
+from app.routers.discovery import AGENT_CARDS, ALL_AGENTS, agents_matching
+from app.routers.tools import CapabilitiesListRequest
+from app.tool_definitions import TOOL_SCHEMAS, get_validator
 
 logger = logging.getLogger(__name__)
 
@@ -62,111 +75,112 @@ server = Server("moat-mcp")
 # Default tenant for the scout agent
 _DEFAULT_TENANT = "automaton"
 
+# Pooled upstream client shared by every tool call; opened and closed by _run().
+_http: httpx.AsyncClient | None = None
+
 
 # ---------------------------------------------------------------------------
 # Tool listing
 # ---------------------------------------------------------------------------
 
 
+# Tool schemas are static, so the Tool models are built once at import.
+_TOOLS: list[Tool] = [
+    Tool(
+        name=schema["name"],
+        description=schema["description"],
+        inputSchema=thaw(schema["input_schema"]),
+    )
+    for schema in TOOL_SCHEMAS
+]
+
+
 @server.list_tools()
 async def list_tools() -> list[Tool]:
-    """Return all 8 Moat tools with their schemas."""
-    return [
-        Tool(
-            name=schema["name"],
-            description=schema["description"],
-            inputSchema=schema["input_schema"],
-        )
-        for schema in TOOL_SCHEMAS
-    ]
+    """Return all Moat tools with their schemas."""
+    return _TOOLS
 
 
 # ---------------------------------------------------------------------------
-# Platform URL mapping for bounty.discover
+# Response helpers
 # ---------------------------------------------------------------------------
 
-_PLATFORM_URLS: dict[str, str] = {
-    "algora": "https://console.algora.io/api/bounties",
-    "gitcoin": "https://gitcoin.co/api/v0.1/bounties/",
-    "polar": "https://api.polar.sh/v1/issues/search",
-    "github": "https://api.github.com/search/issues",
-}
 
+def _json_default(obj: Any) -> Any:
+    """Serialize read-only mappings (e.g. agent cards) as objects, else ``str``."""
+    if isinstance(obj, Mapping):
+        return dict(obj)
+    return str(obj)
 
-# ---------------------------------------------------------------------------
-# Tool dispatch
-# ---------------------------------------------------------------------------
+
+def _ok_or_err(outcome: Any) -> Any:
+    """Turn an exception returned by ``gather`` into an ``{"error": ...}`` dict."""
+    return {"error": str(outcome)} if isinstance(outcome, Exception) else outcome
+
+
+# Compact output by default; MOAT_MCP_PRETTY=1 indents it for debugging.
+_DUMPS_OPTIONS = orjson.OPT_NON_STR_KEYS | (
+    orjson.OPT_INDENT_2 if settings.MOAT_MCP_PRETTY else 0
+)
 
 
 def _text(data: Any) -> list[TextContent]:
     """Wrap a result dict as a JSON TextContent response."""
-    return [TextContent(type="text", text=json.dumps(data, indent=2, default=str))]
+    text = orjson.dumps(data, default=_json_default, option=_DUMPS_OPTIONS).decode()
+    return [TextContent(type="text", text=text)]
 
 
-@server.call_tool()
-async def call_tool(name: str, arguments: dict[str, Any]) -> list[TextContent]:
-    """Dispatch a tool call to the appropriate handler."""
-    tenant = arguments.pop("tenant_id", _DEFAULT_TENANT)
+# ---------------------------------------------------------------------------
+# Core capability handlers
+# ---------------------------------------------------------------------------
 
-    # ── Core capability tools ──────────────────────────────────────────
-    if name == "capabilities.list":
-        filt = arguments.get("filter", {})
-        result = await cp_list_capabilities(
-            provider=filt.get("provider"),
-            status=filt.get("status"),
-        )
-        return _text(result)
-
-    if name == "capabilities.search":
-        query = arguments.get("query", "")
-        data = await cp_list_capabilities()
-        items = data.get("items", [])
-        query_lower = query.lower()
-        matches = [
-            item
-            for item in items
-            if query_lower in item.get("name", "").lower()
-            or query_lower in item.get("description", "").lower()
-        ]
-        return _text({"items": matches, "total": len(matches), "query": query})
-
-    if name == "capabilities.execute":
-        cap_id = arguments["capability_id"]
-        result = await gw_execute(
-            capability_id=cap_id,
-            params=arguments.get("params", {}),
-            tenant_id=tenant,
-            idempotency_key=arguments.get("idempotency_key"),
-            scope=arguments.get("scope", "execute"),
-        )
-        return _text(result)
 
-    if name == "capabilities.stats":
-        cap_id = arguments["capability_id"]
-        result = await tp_get_stats(cap_id)
-        return _text(result)
+async def _handle_capabilities_list(args: dict[str, Any], tenant: str) -> Any:
+    """List capabilities from the control plane registry."""
+    filt = CapabilitiesListRequest.model_validate(args).filter
+    return await cp_list_capabilities(
+        provider=filt.provider,
+        status=filt.status,
+        verified=filt.verified,
+        client=_http,
+    )
 
-    # ── Scout-workflow tools ───────────────────────────────────────────
-    if name == "bounty.discover":
-        return _text(await _handle_bounty_discover(arguments, tenant))
 
-    if name == "bounty.triage":
-        return _text(await _handle_bounty_triage(arguments, tenant))
+async def _handle_capabilities_search(args: dict[str, Any], tenant: str) -> Any:
+    """Substring search over capability names, descriptions and tags."""
+    query = args.get("query", "")
+    _, matches = await cp_search_capabilities(query, client=_http)
+    return {"items": matches, "total": len(matches), "query": query}
 
-    if name == "bounty.execute":
-        return _text(await _handle_bounty_execute(arguments, tenant))
 
-    if name == "bounty.status":
-        return _text(await _handle_bounty_status(arguments, tenant))
+async def _handle_capabilities_execute(args: dict[str, Any], tenant: str) -> Any:
+    """Execute a capability through the gateway."""
+    return await gw_execute(
+        capability_id=args["capability_id"],
+        params=args.get("params", {}),
+        tenant_id=tenant,
+        idempotency_key=args.get("idempotency_key"),
+        scope=args.get("scope", "execute"),
+        client=_http,
+    )
 
-    # ── A2A Discovery tools ─────────────────────────────────────────
-    if name == "agents.discover":
-        return _text(await _handle_agents_discover(arguments))
 
-    if name == "agents.card":
-        return _text(await _handle_agents_card(arguments))
+async def _handle_capabilities_execute_batch(args: dict[str, Any], tenant: str) -> Any:
+    """Execute a dependency graph of capabilities layer by layer."""
+    try:
+        return await gw_execute_batch(
+            args["calls"],
+            [tuple(edge) for edge in args.get("edges", [])],
+            tenant,
+            client=_http,
+        )
+    except ValueError as exc:
+        return {"error": str(exc)}
+
 
-    return _text({"error": f"Unknown tool: {name}"})
+async def _handle_capabilities_stats(args: dict[str, Any], tenant: str) -> Any:
+    """Fetch reliability stats from the trust plane."""
+    return await tp_get_stats(args["capability_id"], client=_http)
 
 
 # ---------------------------------------------------------------------------
@@ -176,64 +190,20 @@ async def call_tool(name: str, arguments: dict[str, Any]) -> list[TextContent]:
 
 async def _handle_bounty_discover(args: dict[str, Any], tenant: str) -> dict[str, Any]:
     """Search bounty platforms via http.proxy capability."""
-    platform = args.get("platform", "algora")
-    query = args.get("query", "")
-    max_results = args.get("max_results", 20)
-
-    base_url = _PLATFORM_URLS.get(platform)
-    if not base_url:
-        return {
-            "error": f"Unknown platform: {platform}",
-            "supported": list(_PLATFORM_URLS.keys()),
-        }
-
-    # Build platform-specific query params
-    params: dict[str, Any] = {"url": base_url, "method": "GET"}
-
-    if platform == "algora":
-        if query:
-            params["url"] = f"{base_url}?q={query}&limit={max_results}"
-        else:
-            params["url"] = f"{base_url}?limit={max_results}"
-    elif platform == "github":
-        q_parts = ["type:issue", "state:open", "label:bounty"]
-        if query:
-            q_parts.insert(0, query)
-        if args.get("language"):
-            q_parts.append(f"language:{args['language']}")
-        params["url"] = f"{base_url}?q={'+'.join(q_parts)}&per_page={max_results}"
-    elif platform == "gitcoin":
-        params["url"] = f"{base_url}?is_open=true&limit={max_results}"
-        if query:
-            params["url"] += f"&keyword={query}"
-    elif platform == "polar":
-        params["url"] = f"{base_url}?have_badge=true&limit={max_results}"
-        if query:
-            params["url"] += f"&q={query}"
-
-    result = await gw_execute(
-        capability_id="http.proxy",
-        params=params,
+    return await gw_execute_bounty_discover(
+        platform=args.get("platform", "algora"),
+        query=args.get("query", ""),
+        language=args.get("language"),
+        max_results=args.get("max_results", 20),
         tenant_id=tenant,
-        scope="execute",
+        client=_http,
     )
 
-    return {
-        "platform": platform,
-        "query": query,
-        "gateway_receipt": result,
-    }
-
 
 async def _handle_bounty_triage(args: dict[str, Any], tenant: str) -> dict[str, Any]:
     """Triage a GitHub issue via GWI triage capability."""
     url = args["url"]
-    result = await gw_execute(
-        capability_id="gwi.triage",
-        params={"url": url},
-        tenant_id=tenant,
-        scope="execute",
-    )
+    result = await gw_execute_gwi_triage(url=url, tenant_id=tenant, client=_http)
     return {
         "url": url,
         "command": "triage",
@@ -257,6 +227,7 @@ async def _handle_bounty_execute(args: dict[str, Any], tenant: str) -> dict[str,
         params={"url": url},
         tenant_id=tenant,
         scope="execute",
+        client=_http,
     )
     return {
         "url": url,
@@ -271,28 +242,16 @@ async def _handle_bounty_status(args: dict[str, Any], tenant: str) -> dict[str,
     cap_id = args.get("capability_id", "gwi.triage")
 
     # Fetch trust plane stats and triage result in parallel
-    stats_task = asyncio.create_task(tp_get_stats(cap_id))
-    triage_task = asyncio.create_task(
-        gw_execute(
-            capability_id="gwi.triage",
-            params={"url": url},
-            tenant_id=tenant,
-            scope="execute",
-        )
-    )
-
     stats, triage = await asyncio.gather(
-        stats_task, triage_task, return_exceptions=True
+        tp_get_stats(cap_id, client=_http),
+        gw_execute_gwi_triage(url=url, tenant_id=tenant, client=_http),
+        return_exceptions=True,
     )
 
     return {
         "url": url,
-        "trust_stats": stats
-        if not isinstance(stats, Exception)
-        else {"error": str(stats)},
-        "triage_result": triage
-        if not isinstance(triage, Exception)
-        else {"error": str(triage)},
+        "trust_stats": _ok_or_err(stats),
+        "triage_result": _ok_or_err(triage),
     }
 
 
@@ -301,32 +260,16 @@ async def _handle_bounty_status(args: dict[str, Any], tenant: str) -> dict[str,
 # ---------------------------------------------------------------------------
 
 
-async def _handle_agents_discover(args: dict[str, Any]) -> dict[str, Any]:
+async def _handle_agents_discover(args: dict[str, Any], tenant: str) -> dict[str, Any]:
     """List all known agents, optionally filtered by skill tag."""
-    from app.routers.discovery import AGENT_CARDS
-
-    agents = list(AGENT_CARDS.values())
     skill_tag = args.get("skill_tag")
-
-    if skill_tag:
-        tag_lower = skill_tag.lower()
-        agents = [
-            agent
-            for agent in agents
-            if any(
-                tag_lower in tag
-                for skill in agent.get("skills", [])
-                for tag in skill.get("tags", [])
-            )
-        ]
+    agents = agents_matching(skill_tag) if skill_tag else ALL_AGENTS
 
     return {"agents": agents, "total": len(agents)}
 
 
-async def _handle_agents_card(args: dict[str, Any]) -> dict[str, Any]:
+async def _handle_agents_card(args: dict[str, Any], tenant: str) -> Any:
     """Get the AgentCard for a specific agent."""
-    from app.routers.discovery import AGENT_CARDS
-
     agent_name = args.get("agent_name", "")
     card = AGENT_CARDS.get(agent_name)
     if card is None:
@@ -337,6 +280,70 @@ async def _handle_agents_card(args: dict[str, Any]) -> dict[str, Any]:
     return card
 
 
+# ---------------------------------------------------------------------------
+# Tool dispatch
+# ---------------------------------------------------------------------------
+
+_Handler = Callable[[dict[str, Any], str], Awaitable[Any]]
+
+# Tool name -> handler; every handler takes (arguments, tenant).
+_DISPATCH: dict[str, _Handler] = {
+    # ── Core capability tools ──────────────────────────────────────────
+    "capabilities.list": _handle_capabilities_list,
+    "capabilities.search": _handle_capabilities_search,
+    "capabilities.execute": _handle_capabilities_execute,
+    "capabilities.executeBatch": _handle_capabilities_execute_batch,
+    "capabilities.stats": _handle_capabilities_stats,
+    # ── Scout-workflow tools ───────────────────────────────────────────
+    "bounty.discover": _handle_bounty_discover,
+    "bounty.triage": _handle_bounty_triage,
+    "bounty.execute": _handle_bounty_execute,
+    "bounty.status": _handle_bounty_status,
+    # ── A2A Discovery tools ─────────────────────────────────────────
+    "agents.discover": _handle_agents_discover,
+    "agents.card": _handle_agents_card,
+}
+
+
+def _require_validator(name: str) -> Validator:
+    validator = get_validator(name)
+    if validator is None:
+        raise RuntimeError(f"stdio tool {name!r} has no input schema")
+    return validator
+
+
+# Each handler paired with its tool's precompiled validator, resolved once at
+# import so a handler without a schema fails at startup rather than per call.
+_VALIDATED_DISPATCH: dict[str, tuple[_Handler, Validator]] = {
+    name: (handler, _require_validator(name)) for name, handler in _DISPATCH.items()
+}
+
+
+# Arguments are validated here against precompiled validators rather than by
+# the SDK, whose per-call ``jsonschema.validate`` rebuilds one every time.
+@server.call_tool(validate_input=False)
+async def call_tool(
+    name: str, arguments: dict[str, Any]
+) -> list[TextContent] | CallToolResult:
+    """Validate the arguments and dispatch a tool call to its handler."""
+    tool = _VALIDATED_DISPATCH.get(name)
+    if tool is None:
+        return _text({"error": f"Unknown tool: {name}"})
+    handler, validator = tool
+    error = best_match(validator.iter_errors(arguments))
+    if error is not None:
+        return CallToolResult(
+            content=[
+                TextContent(
+                    type="text", text=f"Input validation error: {error.message}"
+                )
+            ],
+            isError=True,
+        )
+    tenant = arguments.get("tenant_id", _DEFAULT_TENANT)
+    return _text(await handler(arguments, tenant))
+
+
 # ---------------------------------------------------------------------------
 # Entry point
 # ---------------------------------------------------------------------------
@@ -346,8 +353,14 @@ async def _run() -> None:
     """Start the MCP stdio server."""
     from mcp.server.stdio import stdio_server
 
-    async with stdio_server() as (read, write):
-        await server.run(read, write, server.create_initialization_options())
+    global _http
+    _http = create_client()
+    try:
+        async with stdio_server() as (read, write):
+            await server.run(read, write, server.create_initialization_options())
+    finally:
+        await _http.aclose()
+        _http = None
 
 
 def main() -> None:
@@ -6,17 +6,32 @@ Single source of truth for all MCP tool schemas.
 Used by both the REST surface (routers/tools.py) and the stdio transport
 (stdio_server.py) so tool names, descriptions, and input schemas are always
 in sync.
+
+The schemas are static: they are frozen into read-only mappings at import,
+the ``GET /tools`` manifest built from them is encoded once as
+:data:`TOOLS_LISTING`, and each input schema is checked and compiled into a
+reusable validator (see :func:`get_validator`).
 """
 
 from __future__ import annotations
 
+from collections.abc import Mapping, Sequence
 from typing import Any
 
+from jsonschema.protocols import Validator
+from jsonschema.validators import validator_for
+
+from app.responses import StaticJSON, freeze, thaw
+
+# Largest number of calls accepted by one capabilities.executeBatch request,
+# matching the trust plane's outcome event batch cap.
+MAX_BATCH_CALLS = 100
+
 # ---------------------------------------------------------------------------
 # Tool schema type
 # ---------------------------------------------------------------------------
 
-TOOL_SCHEMAS: list[dict[str, Any]] = [
+TOOL_SCHEMAS: Sequence[Mapping[str, Any]] = [
     # ── Core capability tools ──────────────────────────────────────────────
     {
         "name": "capabilities.list",
@@ -62,6 +77,45 @@ TOOL_SCHEMAS: list[dict[str, Any]] = [
             },
         },
     },
+    {
+        "name": "capabilities.executeBatch",
+        "description": (
+            "Execute several capabilities in one round trip. An edge [src, dst] "
+            "runs call dst after call src and passes src's result to it as "
+            'params.inputs["<src>"]; independent calls run concurrently.'
+        ),
+        "input_schema": {
+            "type": "object",
+            "required": ["calls", "tenant_id"],
+            "properties": {
+                "calls": {
+                    "type": "array",
+                    "minItems": 1,
+                    "maxItems": MAX_BATCH_CALLS,
+                    "items": {
+                        "type": "object",
+                        "required": ["capability_id"],
+                        "properties": {
+                            "capability_id": {"type": "string"},
+                            "params": {"type": "object"},
+                            "idempotency_key": {"type": "string"},
+                            "scope": {"type": "string"},
+                        },
+                    },
+                },
+                "edges": {
+                    "type": "array",
+                    "items": {
+                        "type": "array",
+                        "items": {"type": "integer", "minimum": 0},
+                        "minItems": 2,
+                        "maxItems": 2,
+                    },
+                },
+                "tenant_id": {"type": "string"},
+            },
+        },
+    },
     {
         "name": "capabilities.stats",
         "description": "Get 7-day reliability stats and trust signals for a capability",
@@ -221,14 +275,57 @@ TOOL_SCHEMAS: list[dict[str, Any]] = [
 ]
 
 
-def get_tool_schema(name: str) -> dict[str, Any] | None:
+# Schemas are static, so lookups are indexed once at import.
+# Shared by every transport, so freeze them against accidental mutation.
+TOOL_SCHEMAS = freeze(TOOL_SCHEMAS)
+
+_TOOL_SCHEMA_BY_NAME: dict[str, Mapping[str, Any]] = {
+    t["name"]: t for t in TOOL_SCHEMAS
+}
+_TOOL_NAMES: tuple[str, ...] = tuple(_TOOL_SCHEMA_BY_NAME)
+
+
+# Body of ``GET /tools``.
+TOOLS_LISTING = StaticJSON(
+    {
+        "tools": [
+            {
+                "name": schema["name"],
+                "endpoint": f"POST /tools/{schema['name']}",
+                "description": schema["description"],
+                "input_schema": schema["input_schema"],
+            }
+            for schema in TOOL_SCHEMAS
+        ]
+    }
+)
+
+
+def _compile_validator(input_schema: Mapping[str, Any]) -> Validator:
+    schema = thaw(input_schema)
+    cls = validator_for(schema)
+    cls.check_schema(schema)
+    return cls(schema)
+
+
+# Tool name -> validator for its input schema. ``jsonschema.validate`` would
+# re-check the schema and rebuild a validator on every call.
+_VALIDATORS: dict[str, Validator] = {
+    name: _compile_validator(schema["input_schema"])
+    for name, schema in _TOOL_SCHEMA_BY_NAME.items()
+}
+
+
+def get_tool_schema(name: str) -> Mapping[str, Any] | None:
     """Return the tool schema for the given tool name, or None."""
-    for tool in TOOL_SCHEMAS:
-        if tool["name"] == name:
-            return tool
-    return None
+    return _TOOL_SCHEMA_BY_NAME.get(name)
 
 
 def get_all_tool_names() -> list[str]:
     """Return a list of all registered tool names."""
-    return [t["name"] for t in TOOL_SCHEMAS]
+    return list(_TOOL_NAMES)
+
+
+def get_validator(name: str) -> Validator | None:
+    """Return the precompiled input-schema validator for a tool, or None."""
+    return _VALIDATORS.get(name)
@@ -29,9 +29,13 @@ def anyio_backend() -> str:
     return "asyncio"
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def test_client() -> Iterator[Any]:
-    """Create a TestClient for the MCP server."""
+    """Create a TestClient for the MCP server, shared across the session.
+
+    App startup (lifespan, shared HTTP client) runs once. Tests patch module
+    attributes with ``monkeypatch`` rather than mutating ``app.state``.
+    """
     from fastapi.testclient import TestClient
 
     from app.main import app
@@ -7,6 +7,7 @@ Covers:
 - /agents/{name} lookup
 - POST /tools/agents.discover
 - POST /tools/agents.card
+- ETag revalidation and Cache-Control of static discovery payloads
 """
 
 
@@ -169,3 +170,160 @@ def test_tools_listing_includes_discovery(test_client):
     tool_names = [t["name"] for t in tools]
     assert "agents.discover" in tool_names
     assert "agents.card" in tool_names
+
+
+# ---------------------------------------------------------------------------
+# Frozen AgentCards
+# ---------------------------------------------------------------------------
+
+
+def test_agent_cards_are_read_only():
+    """Module-level cards cannot be mutated by handlers or callers."""
+    import pytest
+
+    from app.routers.discovery import AGENT_CARDS
+
+    card = AGENT_CARDS["moat-mcp-server"]
+    with pytest.raises(TypeError):
+        card["name"] = "tampered"  # type: ignore[index]
+    assert isinstance(card["skills"], tuple)
+    with pytest.raises(TypeError):
+        card["skills"][0]["id"] = "tampered"  # type: ignore[index]
+    with pytest.raises(TypeError):
+        AGENT_CARDS["rogue"] = card  # type: ignore[index]
+
+
+def test_tool_schemas_are_read_only():
+    """Tool schemas are frozen; stdio hands the SDK plain-dict copies."""
+    import pytest
+
+    from app import stdio_server
+    from app.responses import thaw
+    from app.tool_definitions import TOOL_SCHEMAS
+
+    with pytest.raises(TypeError):
+        TOOL_SCHEMAS[0]["input_schema"]["type"] = "array"  # type: ignore[index]
+    for tool, schema in zip(stdio_server._TOOLS, TOOL_SCHEMAS, strict=True):
+        assert isinstance(tool.inputSchema, dict)
+        assert tool.inputSchema == thaw(schema["input_schema"])
+
+
+def test_agents_matching_agrees_with_full_scan():
+    """The skill-tag index returns the same agents as scanning every tag."""
+    from app.routers.discovery import AGENT_CARDS, SKILL_TAG_INDEX, agents_matching
+
+    for query in [*SKILL_TAG_INDEX, "EXEC", "a", "no-such-tag"]:
+        expected = tuple(
+            card
+            for card in AGENT_CARDS.values()
+            if any(
+                query.lower() in tag.lower()
+                for skill in card["skills"]
+                for tag in skill.get("tags", ())
+            )
+        )
+        assert agents_matching(query) == expected
+
+    from app.routers.discovery import AGENTS_BY_TAG
+
+    for tag, agents in AGENTS_BY_TAG.items():
+        assert agents_matching(tag.upper()) is agents
+
+
+def test_stdio_text_serializes_frozen_card():
+    """stdio JSON output renders frozen cards as plain objects."""
+    import json
+
+    from app.routers.discovery import AGENT_CARDS
+    from app.stdio_server import _text
+
+    [content] = _text(AGENT_CARDS["moat-gateway"])
+    card = json.loads(content.text)
+    assert card["name"] == "moat-gateway"
+    assert card["skills"][0]["id"] == "execute"
+
+
+# ---------------------------------------------------------------------------
+# /openapi.json
+# ---------------------------------------------------------------------------
+
+
+def test_openapi_schema_served(test_client):
+    """Schema discovery serves the pre-encoded OpenAPI document."""
+    resp = test_client.get("/openapi.json")
+    assert resp.status_code == 200
+    assert resp.headers["content-type"] == "application/json"
+    schema = resp.json()
+    assert schema["info"]["title"] == "Moat MCP Server"
+    assert "/tools/agents.discover" in schema["paths"]
+    assert "/openapi.json" not in schema["paths"]
+
+
+def test_openapi_schema_served_without_lifespan():
+    """The schema does not depend on startup having run."""
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+
+    resp = TestClient(app).get("/openapi.json")
+    assert resp.status_code == 200
+    assert resp.json()["info"]["title"] == "Moat MCP Server"
+
+
+def test_interactive_docs_point_at_schema(test_client):
+    """/docs and /redoc load the served schema in local environments."""
+    for path in ("/docs", "/redoc"):
+        resp = test_client.get(path)
+        assert resp.status_code == 200
+        assert "/openapi.json" in resp.text
+
+
+def test_static_payloads_served_pre_gzipped(test_client):
+    """Large static payloads honour Accept-Encoding without re-encoding."""
+    gz = test_client.get("/tools", headers={"Accept-Encoding": "gzip"})
+    assert gz.headers["content-encoding"] == "gzip"
+    assert "agents.card" in [t["name"] for t in gz.json()["tools"]]
+
+    plain = test_client.get("/tools", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in plain.headers
+    assert plain.json() == gz.json()
+
+
+def test_static_payloads_revalidate_with_etag(test_client):
+    """A matching If-None-Match gets a bodiless 304 for every variant."""
+    for path in ("/.well-known/agent.json", "/agents", "/agents?skill_tag=GWI"):
+        first = test_client.get(path)
+        etag = first.headers["etag"]
+        assert etag.startswith('W/"')
+
+        resp = test_client.get(path, headers={"If-None-Match": etag})
+        assert resp.status_code == 304
+        assert resp.content == b""
+        assert resp.headers["etag"] == etag
+
+        resp = test_client.get(path, headers={"If-None-Match": f'"other", {etag[2:]}'})
+        assert resp.status_code == 304
+
+        resp = test_client.get(path, headers={"If-None-Match": 'W/"stale"'})
+        assert resp.status_code == 200
+        assert resp.json() == first.json()
+
+    all_agents = test_client.get("/agents").headers["etag"]
+    assert test_client.get("/agents?skill_tag=gwi").headers["etag"] != all_agents
+
+
+def test_static_payloads_are_revalidatable(test_client):
+    """Static discovery bodies may be stored; other responses stay no-store."""
+    for path in ("/.well-known/agent.json", "/agents", "/agents/moat-gateway"):
+        resp = test_client.get(path)
+        assert resp.headers["cache-control"] == "no-cache"
+        assert "etag" in resp.headers
+
+        resp = test_client.get(path, headers={"If-None-Match": resp.headers["etag"]})
+        assert resp.status_code == 304
+        assert resp.headers["cache-control"] == "no-cache"
+
+    resp = test_client.post(
+        "/tools/agents.discover", json={}, headers={"X-Tenant-ID": "dev-tenant"}
+    )
+    assert "no-store" in resp.headers["cache-control"]
@@ -0,0 +1,267 @@
+"""
+Tests for the upstream HTTP client helpers.
+
+Covers:
+- The shared client is handed to REST tool endpoints and stdio tool calls
+- Stub fallback when an upstream service is unreachable
+- TTL / single-flight caching of the capability listing
+- Capability search over the pre-lowercased index
+- TTL / single-flight caching of trust plane stats and triage receipts
+- Size caps and expiry cleanup of those caches
+- The verified filter on capability listings
+- Bounty platform search URLs are URL-encoded
+"""
+
+import asyncio
+
+import httpx
+import pytest
+import respx
+
+from app import http_client
+from app.config import settings
+from app.http_client import (
+    cp_list_capabilities,
+    cp_search_capabilities,
+    tp_get_stats,
+)
+
+
+@pytest.fixture
+def empty_caps_cache():
+    http_client._CAPS_CACHE.clear()
+    yield
+    http_client._CAPS_CACHE.clear()
+
+
+@pytest.fixture
+def empty_tp_cache():
+    http_client._TP_CACHE.clear()
+    yield
+    http_client._TP_CACHE.clear()
+
+
+def test_lifespan_shares_one_client(test_client, monkeypatch):
+    """Tool endpoints receive the client created by the app lifespan."""
+    from app.routers import tools
+
+    seen = []
+
+    async def _stats(capability_id, *, client=None):
+        seen.append(client)
+        return {"capability_id": capability_id}
+
+    monkeypatch.setattr(tools, "tp_get_stats", _stats)
+
+    for _ in range(2):
+        resp = test_client.post(
+            "/tools/capabilities.stats",
+            json={"capability_id": "cap-1"},
+            headers={"X-Tenant-ID": "dev-tenant"},
+        )
+        assert resp.status_code == 200
+
+    shared = test_client.app.state.http
+    assert isinstance(shared, httpx.AsyncClient)
+    assert seen == [shared, shared]
+
+
+@respx.mock
+async def test_stub_returned_when_upstream_down(empty_tp_cache):
+    """Connection errors produce a stub payload instead of raising."""
+    respx.get(f"{settings.TRUST_PLANE_URL}/capabilities/cap-1/stats").mock(
+        side_effect=httpx.ConnectError("refused")
+    )
+    async with httpx.AsyncClient() as client:
+        result = await tp_get_stats("cap-1", client=client)
+    assert result["_stub"] is True
+    assert result["capability_id"] == "cap-1"
+
+
+@respx.mock
+async def test_capability_listing_cached(empty_caps_cache):
+    """Concurrent and repeated lookups share one upstream request."""
+    route = respx.get(f"{settings.CONTROL_PLANE_URL}/capabilities").mock(
+        return_value=httpx.Response(200, json={"items": [], "total": 0})
+    )
+    results = await asyncio.gather(*(cp_search_capabilities("x") for _ in range(5)))
+    await cp_search_capabilities("y")
+    assert route.call_count == 1
+    assert all(r == ({"items": [], "total": 0}, []) for r in results)
+
+
+@respx.mock
+async def test_capability_listing_stub_not_cached(empty_caps_cache):
+    """An unreachable control plane is retried on the next lookup."""
+    route = respx.get(f"{settings.CONTROL_PLANE_URL}/capabilities").mock(
+        side_effect=httpx.ConnectError("refused")
+    )
+    data, matches = await cp_search_capabilities("x")
+    assert data["_stub"] is True
+    assert matches == []
+    await cp_search_capabilities("x")
+    assert route.call_count == 2
+
+
+@respx.mock
+async def test_capability_search_matches_fields(empty_caps_cache):
+    """Queries match name, description and tags case-insensitively."""
+    items = [
+        {"id": "a", "name": "Image Gen", "description": "Draws", "tags": []},
+        {"id": "b", "name": "Echo", "description": "Repeats IMAGES", "tags": []},
+        {"id": "c", "name": "Proxy", "description": None, "tags": ["Image"]},
+        {"id": "d", "name": "Translate", "description": "Text", "tags": ["nlp"]},
+    ]
+    respx.get(f"{settings.CONTROL_PLANE_URL}/capabilities").mock(
+        return_value=httpx.Response(200, json={"items": items, "total": 4})
+    )
+    _, matches = await cp_search_capabilities("imAGE")
+    assert [m["id"] for m in matches] == ["a", "b", "c"]
+    _, matches = await cp_search_capabilities("nlp")
+    assert [m["id"] for m in matches] == ["d"]
+    for blank in ("", "   "):
+        _, matches = await cp_search_capabilities(blank)
+        assert len(matches) == 4
+
+
+@respx.mock
+async def test_capability_listing_verified_filter():
+    """``verified`` is forwarded upstream and enforced on the response."""
+    items = [{"id": "a", "verified": True}, {"id": "b"}, {"id": "c", "verified": False}]
+    route = respx.get(f"{settings.CONTROL_PLANE_URL}/capabilities").mock(
+        return_value=httpx.Response(200, json={"items": items, "total": 3})
+    )
+    data = await cp_list_capabilities(provider="acme", verified=True)
+    assert route.calls.last.request.url.params["verified"] == "true"
+    assert data == {"items": [{"id": "a", "verified": True}], "total": 1}
+
+
+async def test_stdio_tools_use_shared_client(monkeypatch):
+    """stdio tool calls pass the transport's pooled client to the helpers."""
+    from app import stdio_server
+
+    seen = []
+
+    async def _stats(capability_id, *, client=None):
+        seen.append(client)
+        return {"capability_id": capability_id}
+
+    async with httpx.AsyncClient() as shared:
+        monkeypatch.setattr(stdio_server, "_http", shared)
+        monkeypatch.setattr(stdio_server, "tp_get_stats", _stats)
+        await stdio_server.call_tool("capabilities.stats", {"capability_id": "c"})
+    assert seen == [shared]
+
+
+async def test_bounty_discover_encodes_query(monkeypatch):
+    """Free-text queries cannot inject extra parameters into platform URLs."""
+    sent = []
+
+    async def _gw(capability_id, params, tenant_id, **kwargs):
+        sent.append(params["url"])
+        return {}
+
+    monkeypatch.setattr(http_client, "gw_execute", _gw)
+
+    await http_client.gw_execute_bounty_discover(
+        platform="github", query="rust & c++", language="python", max_results=5
+    )
+    await http_client.gw_execute_bounty_discover(platform="algora", max_results=3)
+    assert sent == [
+        "https://api.github.com/search/issues"
+        "?q=rust+%26+c%2B%2B+type%3Aissue+state%3Aopen+label%3Abounty"
+        "+language%3Apython&per_page=5",
+        "https://console.algora.io/api/bounties?limit=3",
+    ]
+
+    result = await http_client.gw_execute_bounty_discover(platform="nope")
+    assert result["error"] == "Unknown platform: nope"
+
+
+@respx.mock
+async def test_trust_stats_cached_and_coalesced(empty_tp_cache):
+    """Concurrent and repeated stats lookups share one upstream request."""
+    route = respx.get(f"{settings.TRUST_PLANE_URL}/capabilities/cap-1/stats").mock(
+        return_value=httpx.Response(200, json={"capability_id": "cap-1"})
+    )
+    results = await asyncio.gather(*(tp_get_stats("cap-1") for _ in range(5)))
+    await tp_get_stats("cap-1")
+    assert route.call_count == 1
+    assert all(r == {"capability_id": "cap-1"} for r in results)
+    assert http_client._TP_INFLIGHT == {}
+
+
+async def test_single_flight_survives_leader_cancellation():
+    """Waiters re-fetch if the caller running the shared fetch is cancelled."""
+    inflight: dict = {}
+    calls = 0
+    release = asyncio.Event()
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            await release.wait()
+        return calls
+
+    leader = asyncio.create_task(http_client._single_flight(inflight, "k", fetch))
+    await asyncio.sleep(0)
+    waiter = asyncio.create_task(http_client._single_flight(inflight, "k", fetch))
+    await asyncio.sleep(0)
+    leader.cancel()
+    assert await waiter == 2
+    assert inflight == {}
+
+
+async def test_triage_receipts_cached_per_tenant(monkeypatch):
+    """Successful triage receipts are reused per (tenant, url); failures are not."""
+    http_client._TRIAGE_CACHE.clear()
+    calls = []
+
+    async def _gw(capability_id, params, tenant_id, **kwargs):
+        calls.append((tenant_id, params["url"]))
+        ok = params["url"] != "bad"
+        return {"status": "success" if ok else "failure"}
+
+    monkeypatch.setattr(http_client, "gw_execute", _gw)
+
+    await asyncio.gather(
+        http_client.gw_execute_gwi_triage("u", "t1"),
+        http_client.gw_execute_gwi_triage("u", "t1"),
+    )
+    await http_client.gw_execute_gwi_triage("u", "t1")
+    await http_client.gw_execute_gwi_triage("u", "t2")
+    await http_client.gw_execute_gwi_triage("bad", "t1")
+    await http_client.gw_execute_gwi_triage("bad", "t1")
+    assert calls == [("t1", "u"), ("t2", "u"), ("t1", "bad"), ("t1", "bad")]
+    http_client._TRIAGE_CACHE.clear()
+
+
+@respx.mock
+async def test_trust_stats_cache_is_bounded(empty_tp_cache, monkeypatch):
+    """Expired entries are dropped on lookup; a full cache evicts its oldest."""
+    respx.get(url__regex=rf"{settings.TRUST_PLANE_URL}/capabilities/.+/stats").mock(
+        return_value=httpx.Response(200, json={})
+    )
+    monkeypatch.setattr(http_client, "_TP_CACHE_MAX", 2)
+    for cap in ("a", "b", "c"):
+        await tp_get_stats(cap)
+    assert list(http_client._TP_CACHE) == ["b", "c"]
+
+    assert http_client._cache_get(http_client._TP_CACHE, "b", 0.0) is None
+    assert list(http_client._TP_CACHE) == ["c"]
+
+
+async def test_triage_cache_is_bounded(monkeypatch):
+    """New URLs evict the oldest receipt once the cache is full."""
+    http_client._TRIAGE_CACHE.clear()
+
+    async def _gw(capability_id, params, tenant_id, **kwargs):
+        return {"status": "success"}
+
+    monkeypatch.setattr(http_client, "gw_execute", _gw)
+    monkeypatch.setattr(http_client, "_TRIAGE_CACHE_MAX", 2)
+    for url in ("u1", "u2", "u3"):
+        await http_client.gw_execute_gwi_triage(url, "t1")
+    assert list(http_client._TRIAGE_CACHE) == [("t1", "u2"), ("t1", "u3")]
+    http_client._TRIAGE_CACHE.clear()
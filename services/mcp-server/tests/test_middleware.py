@@ -0,0 +1,118 @@
+"""
+Tests for MCP server middleware.
+
+Covers:
+- FastCORSMiddleware preflight and simple-response headers
+- RequestIDMiddleware header echo / generation
+- Request ID propagation to the unhandled-exception handler
+"""
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.middleware import FastCORSMiddleware
+
+
+def _cors_client(origins):
+    app = FastAPI()
+    app.add_middleware(FastCORSMiddleware, allow_origins=origins)
+
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    return TestClient(app)
+
+
+# ---------------------------------------------------------------------------
+# FastCORSMiddleware
+# ---------------------------------------------------------------------------
+
+
+def test_cors_preflight_allowed_origin():
+    """Preflight from an allowed origin echoes origin and requested headers."""
+    client = _cors_client(["https://app.example"])
+    resp = client.options(
+        "/ping",
+        headers={
+            "Origin": "https://app.example",
+            "Access-Control-Request-Method": "POST",
+            "Access-Control-Request-Headers": "X-Tenant-ID",
+        },
+    )
+    assert resp.status_code == 200
+    assert resp.headers["access-control-allow-origin"] == "https://app.example"
+    assert resp.headers["access-control-allow-credentials"] == "true"
+    assert resp.headers["access-control-allow-headers"] == "X-Tenant-ID"
+    assert "POST" in resp.headers["access-control-allow-methods"]
+
+
+def test_cors_preflight_disallowed_origin():
+    """Preflight from an unknown origin is rejected without an allow-origin."""
+    client = _cors_client(["https://app.example"])
+    resp = client.options(
+        "/ping",
+        headers={
+            "Origin": "https://evil.example",
+            "Access-Control-Request-Method": "GET",
+        },
+    )
+    assert resp.status_code == 400
+    assert "access-control-allow-origin" not in resp.headers
+
+
+def test_cors_simple_request_wildcard_echoes_origin():
+    """With credentials allowed, wildcard config echoes the caller's origin."""
+    client = _cors_client(["*"])
+    resp = client.get("/ping", headers={"Origin": "https://any.example"})
+    assert resp.status_code == 200
+    assert resp.headers["access-control-allow-origin"] == "https://any.example"
+    assert resp.headers["access-control-allow-credentials"] == "true"
+    assert "Origin" in resp.headers["vary"]
+
+
+def test_cors_simple_request_without_origin():
+    """Requests without an Origin header get no allow-origin header."""
+    client = _cors_client(["https://app.example"])
+    resp = client.get("/ping")
+    assert resp.status_code == 200
+    assert "access-control-allow-origin" not in resp.headers
+
+
+# ---------------------------------------------------------------------------
+# Request ID propagation
+# ---------------------------------------------------------------------------
+
+
+def test_request_id_echoed(test_client):
+    """An inbound X-Request-ID is echoed back unchanged."""
+    resp = test_client.get("/healthz", headers={"X-Request-ID": "req-abc"})
+    assert resp.headers["x-request-id"] == "req-abc"
+
+
+def test_request_id_generated(test_client):
+    """Requests without X-Request-ID get a freshly generated ID."""
+    first = test_client.get("/healthz").headers["x-request-id"]
+    second = test_client.get("/healthz").headers["x-request-id"]
+    assert first and second and first != second
+
+
+def test_unhandled_exception_reports_request_id(test_client, monkeypatch):
+    """500 responses carry the request ID set by the middleware."""
+    from app.routers import tools
+
+    async def _boom(capability_id, **kwargs):
+        raise RuntimeError("trust plane exploded")
+
+    monkeypatch.setattr(tools, "tp_get_stats", _boom)
+
+    # Reuse the session app without re-entering its lifespan, which would
+    # replace (and then close) the shared HTTP client.
+    client = TestClient(test_client.app, raise_server_exceptions=False)
+    resp = client.post(
+        "/tools/capabilities.stats",
+        json={"capability_id": "cap-1"},
+        headers={"X-Tenant-ID": "dev-tenant", "X-Request-ID": "req-500"},
+    )
+    assert resp.status_code == 500
+    assert resp.json()["request_id"] == "req-500"
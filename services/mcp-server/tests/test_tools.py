@@ -0,0 +1,263 @@
+"""
+Tests for MCP tool endpoints that call upstream services.
+
+Upstream helpers are monkeypatched so no service needs to be running.
+
+Covers:
+- Request ID in the tool response envelope
+- bounty.status fan-out with partial upstream failure (REST and stdio)
+- capabilities.executeBatch layering, result propagation, validation and
+  size/concurrency limits
+- stdio tool dispatch table and argument validation
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from app import http_client, stdio_server
+from app.http_client import execution_layers
+from app.routers import tools
+from app.tool_definitions import MAX_BATCH_CALLS, get_validator
+
+HEADERS = {"X-Tenant-ID": "dev-tenant"}
+
+
+async def _stats(capability_id, *, client=None):
+    return {"capability_id": capability_id, "success_rate_7d": 0.9}
+
+
+async def _triage(url, tenant_id, **kwargs):
+    return {"capability_id": "gwi.triage", "status": "success"}
+
+
+async def _fail(*args, **kwargs):
+    raise RuntimeError("gateway down")
+
+
+def test_bounty_status_partial_failure(test_client, monkeypatch):
+    """A failing upstream call is reported inline; the other result survives."""
+    monkeypatch.setattr(tools, "tp_get_stats", _stats)
+    monkeypatch.setattr(tools, "gw_execute_gwi_triage", _fail)
+
+    resp = test_client.post(
+        "/tools/bounty.status",
+        json={"url": "https://github.com/o/r/issues/1"},
+        headers=HEADERS,
+    )
+    assert resp.status_code == 200
+    result = resp.json()["result"]
+    assert result["trust_stats"]["success_rate_7d"] == 0.9
+    assert result["triage_result"] == {"error": "gateway down"}
+
+
+def test_tool_envelope_carries_request_id(test_client):
+    """The envelope reuses the ID assigned by RequestIDMiddleware."""
+    resp = test_client.post(
+        "/tools/agents.discover",
+        json={},
+        headers={**HEADERS, "X-Request-ID": "req-envelope"},
+    )
+    assert resp.json()["request_id"] == "req-envelope"
+
+    resp = test_client.post("/tools/agents.discover", json={}, headers=HEADERS)
+    assert resp.json()["request_id"] == resp.headers["x-request-id"]
+
+
+async def test_stdio_bounty_status_partial_failure(monkeypatch):
+    """The stdio handler reports failures the same way as the REST endpoint."""
+    monkeypatch.setattr(stdio_server, "tp_get_stats", _fail)
+    monkeypatch.setattr(stdio_server, "gw_execute_gwi_triage", _triage)
+
+    content = await stdio_server.call_tool(
+        "bounty.status", {"url": "https://github.com/o/r/issues/1"}
+    )
+    result = json.loads(content[0].text)
+    assert result["trust_stats"] == {"error": "gateway down"}
+    assert result["triage_result"]["status"] == "success"
+
+
+# ---------------------------------------------------------------------------
+# capabilities.executeBatch
+# ---------------------------------------------------------------------------
+
+
+def test_execution_layers():
+    assert execution_layers(4, [(0, 2), (1, 2), (2, 3)]) == [[0, 1], [2], [3]]
+    assert execution_layers(2, []) == [[0, 1]]
+    with pytest.raises(ValueError, match="cycle"):
+        execution_layers(2, [(0, 1), (1, 0)])
+    with pytest.raises(ValueError, match="unknown call"):
+        execution_layers(2, [(0, 5)])
+
+
+def test_execute_batch_propagates_results(test_client, monkeypatch):
+    """Dependent calls receive upstream results; failed dependencies skip."""
+    executed = []
+
+    async def _gw(capability_id, params, tenant_id, **kwargs):
+        executed.append((capability_id, params))
+        if capability_id == "broken":
+            return {"capability_id": capability_id, "status": "failure"}
+        return {"capability_id": capability_id, "status": "success", "result": 7}
+
+    monkeypatch.setattr(http_client, "gw_execute", _gw)
+
+    resp = test_client.post(
+        "/tools/capabilities.executeBatch",
+        json={
+            "calls": [
+                {"capability_id": "triage", "params": {"url": "u"}},
+                {"capability_id": "fix", "params": {"url": "u"}},
+                {"capability_id": "broken"},
+                {"capability_id": "after-broken"},
+            ],
+            "edges": [[0, 1], [2, 3]],
+            "tenant_id": "dev-tenant",
+        },
+        headers=HEADERS,
+    )
+    assert resp.status_code == 200
+    result = resp.json()["result"]
+    assert result["layers"] == 2
+    statuses = [r["status"] for r in result["receipts"]]
+    assert statuses == ["success", "success", "failure", "skipped"]
+    assert ("fix", {"url": "u", "inputs": {"0": 7}}) in executed
+    assert all(cap != "after-broken" for cap, _ in executed)
+
+
+def test_execute_batch_rejects_cycles(test_client):
+    resp = test_client.post(
+        "/tools/capabilities.executeBatch",
+        json={
+            "calls": [{"capability_id": "a"}, {"capability_id": "b"}],
+            "edges": [[0, 1], [1, 0]],
+            "tenant_id": "dev-tenant",
+        },
+        headers=HEADERS,
+    )
+    assert resp.status_code == 400
+
+
+def test_execute_batch_tenant_mismatch(test_client):
+    resp = test_client.post(
+        "/tools/capabilities.executeBatch",
+        json={"calls": [{"capability_id": "a"}], "tenant_id": "other-tenant"},
+        headers=HEADERS,
+    )
+    assert resp.status_code == 403
+
+
+def test_execute_batch_rejects_oversized_batches(test_client):
+    calls = [{"capability_id": "a"}] * (MAX_BATCH_CALLS + 1)
+    resp = test_client.post(
+        "/tools/capabilities.executeBatch",
+        json={"calls": calls, "tenant_id": "dev-tenant"},
+        headers=HEADERS,
+    )
+    assert resp.status_code == 422
+    validator = get_validator("capabilities.executeBatch")
+    assert validator is not None
+    errors = validator.iter_errors({"calls": calls, "tenant_id": "dev-tenant"})
+    assert any(e.validator == "maxItems" for e in errors)
+
+
+async def test_execute_batch_bounds_layer_concurrency(monkeypatch):
+    """Independent calls share one layer but only a few run at once."""
+    in_flight = peak = 0
+
+    async def _gw(capability_id, params, tenant_id, **kwargs):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return {"capability_id": capability_id, "status": "success"}
+
+    monkeypatch.setattr(http_client, "gw_execute", _gw)
+    monkeypatch.setattr(http_client.settings, "BATCH_MAX_CONCURRENCY", 3)
+
+    calls = [{"capability_id": f"cap-{i}"} for i in range(10)]
+    result = await http_client.gw_execute_batch(calls, [], "dev-tenant")
+    assert result["layers"] == 1
+    assert result["total"] == 10
+    assert peak == 3
+
+
+# ---------------------------------------------------------------------------
+# stdio dispatch
+# ---------------------------------------------------------------------------
+
+
+def test_stdio_dispatch_covers_every_tool():
+    """Every advertised tool has a stdio handler, and nothing else does."""
+    from app.tool_definitions import get_all_tool_names
+
+    assert set(stdio_server._DISPATCH) == set(get_all_tool_names())
+    assert set(stdio_server._VALIDATED_DISPATCH) == set(stdio_server._DISPATCH)
+
+
+def test_stdio_handler_without_schema_fails_loudly():
+    with pytest.raises(RuntimeError, match="no input schema"):
+        stdio_server._require_validator("no.such.tool")
+
+
+def test_tool_schema_lookup():
+    from app.tool_definitions import TOOL_SCHEMAS, get_tool_schema
+
+    for schema in TOOL_SCHEMAS:
+        assert get_tool_schema(schema["name"]) is schema
+    assert get_tool_schema("no.such.tool") is None
+
+
+async def test_stdio_unknown_tool():
+    content = await stdio_server.call_tool("no.such.tool", {})
+    assert json.loads(content[0].text) == {"error": "Unknown tool: no.such.tool"}
+
+
+async def test_stdio_capabilities_list_validates_filter(monkeypatch):
+    """stdio capabilities.list parses its filter with the REST request model."""
+    seen = {}
+
+    async def _list(provider=None, status=None, verified=None, *, client=None):
+        seen.update(provider=provider, status=status, verified=verified)
+        return {"items": [], "total": 0}
+
+    monkeypatch.setattr(stdio_server, "cp_list_capabilities", _list)
+
+    await stdio_server._handle_capabilities_list(
+        {"filter": {"provider": "acme", "verified": "true"}}, "t-1"
+    )
+    assert seen == {"provider": "acme", "status": None, "verified": True}
+
+
+async def test_stdio_call_tool_validates_arguments(monkeypatch):
+    """Arguments are checked against the tool's precompiled input schema."""
+    from app.tool_definitions import get_validator
+
+    monkeypatch.setattr(stdio_server, "tp_get_stats", _fail)
+
+    result = await stdio_server.call_tool("capabilities.stats", {})
+    assert result.isError
+    assert result.content[0].text == (
+        "Input validation error: 'capability_id' is a required property"
+    )
+    assert get_validator("capabilities.stats") is get_validator("capabilities.stats")
+    assert get_validator("no.such.tool") is None
+
+
+async def test_stdio_call_tool_leaves_arguments_intact(monkeypatch):
+    """The tenant is read from, not popped off, the SDK's argument dict."""
+    seen = []
+
+    async def _stats(capability_id, *, client=None):
+        seen.append(capability_id)
+        return {}
+
+    monkeypatch.setattr(stdio_server, "tp_get_stats", _stats)
+
+    arguments = {"capability_id": "cap-1", "tenant_id": "t-1"}
+    await stdio_server.call_tool("capabilities.stats", arguments)
+    assert arguments == {"capability_id": "cap-1", "tenant_id": "t-1"}
+    assert seen == ["cap-1"]
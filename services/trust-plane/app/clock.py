@@ -0,0 +1,22 @@
+"""
+app.clock
+~~~~~~~~~
+Event time conversions.
+
+Event times are carried as Unix epoch milliseconds; :func:`to_epoch_ms` and
+:func:`from_epoch_ms` convert at the edges.
+"""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime
+
+
+def to_epoch_ms(dt: datetime) -> int:
+    """Convert an aware datetime to Unix epoch milliseconds."""
+    return int(dt.timestamp() * 1000)
+
+
+def from_epoch_ms(ms: int) -> datetime:
+    """Convert Unix epoch milliseconds to an aware UTC datetime."""
+    return datetime.fromtimestamp(ms / 1000, UTC)
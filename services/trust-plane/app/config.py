@@ -31,6 +31,16 @@ class Settings(BaseSettings):
     MIN_SUCCESS_RATE_7D: float = 0.80  # Below this = should_hide
     MAX_P95_LATENCY_MS: float = 10_000.0  # Above this = should_throttle
 
+    # Write-behind ingest: queued events are persisted in batches
+    INGEST_QUEUE_SIZE: int = 10_000
+    INGEST_BATCH_SIZE: int = 256
+    INGEST_FLUSH_INTERVAL_MS: int = 50  # Longest a queued event waits for a batch
+
+    # Read caches: stats are reused for STATS_CACHE_TTL seconds unless an
+    # event for that capability is written first
+    STATS_CACHE_TTL: float = 5.0
+    CAPABILITY_IDS_CACHE_TTL: float = 30.0
+
     # Authentication
     MOAT_JWT_SECRET: str = ""  # Required when auth is enabled
     MOAT_AUTH_DISABLED: bool = False  # Set True only for local dev
@@ -15,15 +15,16 @@ Start with::
 
 from __future__ import annotations
 
+import asyncio
+import json
 import logging
+import os
 import time
-import uuid
 from collections.abc import AsyncIterator
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
 from moat_core.logging import configure_logging
 from moat_core.security_headers import SecurityHeadersMiddleware
 
@@ -67,7 +68,13 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
         "Trust plane database initialized",
         extra={"auth_disabled": settings.MOAT_AUTH_DISABLED},
     )
-    yield
+    writer = asyncio.create_task(stats_store.run_writer())
+    try:
+        yield
+    finally:
+        # Flush accepted events before the engine goes away.
+        await stats_store.stop_writer()
+        await writer
 
     await engine.dispose()
     logger.info("Trust plane shutting down")
@@ -108,24 +115,27 @@ app.add_middleware(SecurityHeadersMiddleware)
 
 @app.middleware("http")
 async def request_id_middleware(request: Request, call_next: object) -> Response:
-    request_id = request.headers.get("X-Request-ID") or str(uuid.uuid4())
+    # 128 random bits as hex: same entropy as a UUID4 without the UUID object.
+    request_id = request.headers.get("X-Request-ID") or os.urandom(16).hex()
     request.state.request_id = request_id
     start = time.monotonic()
 
     response: Response = await call_next(request)  # type: ignore[arg-type]
-    duration_ms = (time.monotonic() - start) * 1000
 
     response.headers["X-Request-ID"] = request_id
-    logger.info(
-        "Request",
-        extra={
-            "request_id": request_id,
-            "method": request.method,
-            "path": request.url.path,
-            "status_code": response.status_code,
-            "duration_ms": round(duration_ms, 2),
-        },
-    )
+    # Skip building the extra dict entirely when INFO is disabled (prod).
+    if logger.isEnabledFor(logging.INFO):
+        duration_ms = (time.monotonic() - start) * 1000
+        logger.info(
+            "Request",
+            extra={
+                "request_id": request_id,
+                "method": request.method,
+                "path": request.url.path,
+                "status_code": response.status_code,
+                "duration_ms": round(duration_ms, 2),
+            },
+        )
     return response
 
 
@@ -134,21 +144,31 @@ async def request_id_middleware(request: Request, call_next: object) -> Response
 # ---------------------------------------------------------------------------
 
 
+# Only the request ID varies between 500 bodies, so the rest is encoded once
+# and the ID is spliced in as a JSON string.
+_ERROR_BODY_PREFIX = (
+    json.dumps(
+        {
+            "error": "internal_server_error",
+            "message": "An unexpected error occurred.",
+        }
+    )[:-1].encode()
+    + b', "request_id": '
+)
+
+
 @app.exception_handler(Exception)
-async def unhandled_exception_handler(request: Request, exc: Exception) -> JSONResponse:
+async def unhandled_exception_handler(request: Request, exc: Exception) -> Response:
     request_id = getattr(request.state, "request_id", "unknown")
     logger.error(
         "Unhandled exception",
         extra={"request_id": request_id, "error": str(exc)},
         exc_info=True,
     )
-    return JSONResponse(
+    return Response(
+        _ERROR_BODY_PREFIX + json.dumps(request_id).encode() + b"}",
         status_code=500,
-        content={
-            "error": "internal_server_error",
-            "message": "An unexpected error occurred.",
-            "request_id": request_id,
-        },
+        media_type="application/json",
     )
 
 
@@ -1,10 +1,11 @@
 """
 app.routers.events
 ~~~~~~~~~~~~~~~~~~
-Outcome event ingestion endpoint.
+Outcome event ingestion endpoints.
 
-The gateway POSTs an OutcomeEvent here after each capability execution.
-Events drive the rolling reliability statistics in the StatsStore.
+The gateway POSTs an OutcomeEvent here after each capability execution, or
+up to ``MAX_EVENT_BATCH`` of them at once to ``/events/batch``. Events drive
+the rolling reliability statistics in the StatsStore.
 
 This endpoint is an internal service-to-service API.
 """
@@ -12,19 +13,25 @@ This endpoint is an internal service-to-service API.
 from __future__ import annotations
 
 import logging
+import time
 from datetime import UTC, datetime
-from typing import Annotated
+from typing import Annotated, Any
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from fastapi.exceptions import RequestValidationError
 from moat_core.auth import get_current_tenant
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, ValidationError
 
+from app.clock import to_epoch_ms
 from app.scoring import EventRecord, stats_store
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/events", tags=["events"])
 
+# Largest number of events accepted by a single POST /events/batch.
+MAX_EVENT_BATCH = 100
+
 
 # ---------------------------------------------------------------------------
 # Request / Response schemas
@@ -34,10 +41,16 @@ router = APIRouter(prefix="/events", tags=["events"])
 class OutcomeEventRequest(BaseModel):
     """Outcome event payload sent by the gateway after each execution."""
 
-    event_id: str = Field(..., description="Unique event ID (UUID v4)")
-    capability_id: str = Field(..., description="Capability that was executed")
-    tenant_id: str = Field(default="", description="Tenant that triggered execution")
-    receipt_id: str = Field(default="", description="Receipt ID from the gateway")
+    event_id: str = Field(..., max_length=64, description="Unique event ID (UUID v4)")
+    capability_id: str = Field(
+        ..., max_length=64, description="Capability that was executed"
+    )
+    tenant_id: str = Field(
+        default="", max_length=128, description="Tenant that triggered execution"
+    )
+    receipt_id: str = Field(
+        default="", max_length=64, description="Receipt ID from the gateway"
+    )
     execution_status: str = Field(
         ...,
         description="Execution result: 'success' or 'failure'",
@@ -47,19 +60,94 @@ class OutcomeEventRequest(BaseModel):
         ge=0,
         description="End-to-end execution latency in milliseconds",
     )
-    occurred_at: str | None = Field(
+    occurred_at: datetime | None = Field(
         default=None,
-        description="ISO 8601 timestamp when the execution occurred (defaults to now)",
+        description=(
+            "ISO 8601 timestamp when the execution occurred (defaults to now; "
+            "assumed UTC when no offset is given)"
+        ),
     )
 
 
 class EventIngestResponse(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     event_id: str
     capability_id: str
     accepted: bool
     message: str
 
 
+class OutcomeEventBatchRequest(BaseModel):
+    """A batch of outcome events; invalid events are skipped, not fatal."""
+
+    events: list[OutcomeEventRequest] = Field(
+        ..., min_length=1, max_length=MAX_EVENT_BATCH
+    )
+
+
+class _RawEventBatch(BaseModel):
+    """Shape-only view of a batch; each event is validated on its own so one
+    bad event does not reject the rest."""
+
+    events: list[Any] = Field(..., min_length=1, max_length=MAX_EVENT_BATCH)
+
+
+class EventBatchIngestResponse(BaseModel):
+    processed: int
+    failed: int
+
+
+# Statuses counted as a successful execution. Gateways send lowercase values,
+# so the lowercase set is tried first and ``str.lower`` only runs on a miss.
+_SUCCESS_STATUSES: frozenset[str] = frozenset({"success", "succeeded", "ok"})
+
+# Both are built once when the model classes are created; binding them here
+# lets the ingest hot path call straight into pydantic-core.
+_OUTCOME_VALIDATOR = OutcomeEventRequest.__pydantic_validator__
+_INGEST_SERIALIZER = EventIngestResponse.__pydantic_serializer__
+_RAW_BATCH_VALIDATOR = _RawEventBatch.__pydantic_validator__
+_BATCH_SERIALIZER = EventBatchIngestResponse.__pydantic_serializer__
+
+
+def _body_validation_error(exc: ValidationError) -> RequestValidationError:
+    """Report a request body validation failure in FastAPI's 422 shape, with
+    each error's ``loc`` rooted at ``body``."""
+    return RequestValidationError(
+        [
+            {**error, "loc": ("body", *error["loc"])}
+            for error in exc.errors(include_url=False)
+        ]
+    )
+
+
+def _to_record(body: OutcomeEventRequest) -> EventRecord:
+    """Normalize a validated event's timestamp and status into an EventRecord."""
+    occurred_at = body.occurred_at
+    if occurred_at is None:
+        occurred_at_ms = time.time_ns() // 1_000_000
+    elif occurred_at.tzinfo is None:
+        occurred_at_ms = to_epoch_ms(occurred_at.replace(tzinfo=UTC))
+    else:
+        occurred_at_ms = to_epoch_ms(occurred_at)
+
+    execution_status = body.execution_status
+    success = (
+        execution_status in _SUCCESS_STATUSES
+        or execution_status.lower() in _SUCCESS_STATUSES
+    )
+
+    return EventRecord(
+        capability_id=body.capability_id,
+        success=success,
+        latency_ms=body.latency_ms,
+        occurred_at_ms=occurred_at_ms,
+        tenant_id=body.tenant_id,
+        receipt_id=body.receipt_id,
+        event_id=body.event_id,
+    )
+
+
 # ---------------------------------------------------------------------------
 # Endpoints
 # ---------------------------------------------------------------------------
@@ -70,55 +158,114 @@ class EventIngestResponse(BaseModel):
     response_model=EventIngestResponse,
     status_code=status.HTTP_201_CREATED,
     summary="Ingest an outcome event",
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {
+                    "schema": OutcomeEventRequest.model_json_schema(),
+                },
+            },
+        },
+    },
 )
 async def ingest_event(
-    body: OutcomeEventRequest,
+    request: Request,
     tenant_id: Annotated[str, Depends(get_current_tenant)],
-) -> EventIngestResponse:
-    """Accept an execution outcome event from the gateway and update rolling stats."""
-    occurred_at: datetime
-    if body.occurred_at:
-        try:
-            occurred_at = datetime.fromisoformat(body.occurred_at)
-            if occurred_at.tzinfo is None:
-                occurred_at = occurred_at.replace(tzinfo=UTC)
-        except ValueError:
-            logger.warning(
-                "Invalid occurred_at format, using current time",
-                extra={"event_id": body.event_id, "occurred_at": body.occurred_at},
-            )
-            occurred_at = datetime.now(UTC)
-    else:
-        occurred_at = datetime.now(UTC)
+) -> Response:
+    """Accept an execution outcome event from the gateway and queue it for
+    the rolling stats.
 
-    success = body.execution_status.lower() in ("success", "succeeded", "ok")
+    The raw body is validated with ``validate_json`` rather than a FastAPI
+    body parameter, skipping the intermediate ``json.loads`` dict, and the
+    response is serialized directly instead of via ``jsonable_encoder``.
+    """
+    try:
+        body = _OUTCOME_VALIDATOR.validate_json(await request.body())
+    except ValidationError as exc:
+        raise _body_validation_error(exc) from exc
 
-    event = EventRecord(
-        capability_id=body.capability_id,
-        success=success,
-        latency_ms=body.latency_ms,
-        occurred_at=occurred_at,
-        tenant_id=body.tenant_id,
-        receipt_id=body.receipt_id,
-    )
+    event = _to_record(body)
 
-    await stats_store.record(event, event_id=body.event_id)
+    # The write happens in the background; the gateway only needs the ack.
+    if not stats_store.enqueue(event):
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Event ingest queue is full, retry later.",
+        )
 
     logger.info(
         "Outcome event ingested",
         extra={
             "event_id": body.event_id,
             "capability_id": body.capability_id,
-            "success": success,
+            "success": event.success,
             "latency_ms": body.latency_ms,
         },
     )
 
-    return EventIngestResponse(
+    result = EventIngestResponse.model_construct(
         event_id=body.event_id,
         capability_id=body.capability_id,
         accepted=True,
-        message="Event accepted and stats updated.",
+        message="Event accepted; stats update shortly.",
+    )
+    return Response(
+        _INGEST_SERIALIZER.to_json(result),
+        status_code=status.HTTP_201_CREATED,
+        media_type="application/json",
+    )
+
+
+@router.post(
+    "/batch",
+    response_model=EventBatchIngestResponse,
+    summary="Ingest a batch of outcome events",
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {
+                    "schema": OutcomeEventBatchRequest.model_json_schema(),
+                },
+            },
+        },
+    },
+)
+async def ingest_event_batch(
+    request: Request,
+    tenant_id: Annotated[str, Depends(get_current_tenant)],
+) -> Response:
+    """Accept up to ``MAX_EVENT_BATCH`` outcome events in one request.
+
+    Valid events are written with a single bulk insert before responding.
+    Events that fail validation, repeat an ``event_id`` earlier in the batch,
+    or were already ingested are skipped and counted in ``failed``.
+    """
+    try:
+        items = _RAW_BATCH_VALIDATOR.validate_json(await request.body()).events
+    except ValidationError as exc:
+        raise _body_validation_error(exc) from exc
+
+    records: list[EventRecord] = []
+    for item in items:
+        try:
+            records.append(_to_record(_OUTCOME_VALIDATOR.validate_python(item)))
+        except ValidationError:
+            continue
+
+    processed = await stats_store.record_many(records)
+
+    failed = len(items) - processed
+    logger.info(
+        "Outcome event batch ingested",
+        extra={"processed": processed, "failed": failed},
+    )
+    return Response(
+        _BATCH_SERIALIZER.to_json(
+            EventBatchIngestResponse(processed=processed, failed=failed)
+        ),
+        media_type="application/json",
     )
 
 
@@ -131,9 +278,4 @@ async def event_count(
     tenant_id: Annotated[str, Depends(get_current_tenant)],
 ) -> dict[str, int]:
     """Return the total number of events currently in the 7-day rolling window."""
-    capability_ids = await stats_store.all_capability_ids()
-    total = 0
-    for cid in capability_ids:
-        s = await stats_store.get_stats(cid)
-        total += s.total_executions_7d
-    return {"total_events_in_window": total}
+    return {"total_events_in_window": await stats_store.total_events_7d()}
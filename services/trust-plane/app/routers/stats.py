@@ -10,11 +10,12 @@ Returns rolling 7-day success rates, p95 latency, and trust signals
 from __future__ import annotations
 
 import logging
+from datetime import datetime
 from typing import Annotated
 
 from fastapi import APIRouter, Depends
 from moat_core.auth import get_optional_tenant
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 from app.scoring import CapabilityStats, should_hide, should_throttle, stats_store
 
@@ -31,11 +32,13 @@ router = APIRouter(prefix="/capabilities", tags=["stats"])
 class StatsResponse(BaseModel):
     """Reliability statistics for a single capability."""
 
+    model_config = ConfigDict(frozen=True)
+
     capability_id: str
     success_rate_7d: float
     p95_latency_ms: float
     total_executions_7d: int
-    last_checked: str | None  # ISO 8601 or null
+    last_checked: datetime | None  # serialized as ISO 8601 or null
     verified: bool
 
     # Trust signals
@@ -73,16 +76,7 @@ async def get_capability_stats(
             "total_executions_7d": stats.total_executions_7d,
         },
     )
-    return StatsResponse(
-        capability_id=stats.capability_id,
-        success_rate_7d=stats.success_rate_7d,
-        p95_latency_ms=stats.p95_latency_ms,
-        total_executions_7d=stats.total_executions_7d,
-        last_checked=stats.last_checked.isoformat() if stats.last_checked else None,
-        verified=stats.verified,
-        should_hide=should_hide(stats),
-        should_throttle=should_throttle(stats),
-    )
+    return _to_response(stats)
 
 
 @router.get(
@@ -94,22 +88,19 @@ async def list_all_stats(
     _tenant_id: Annotated[str | None, Depends(get_optional_tenant)] = None,
 ) -> AllStatsResponse:
     """Return stats for every capability that has recorded at least one event."""
-    capability_ids = await stats_store.all_capability_ids()
-    items: list[StatsResponse] = []
-    for capability_id in capability_ids:
-        stats = await stats_store.get_stats(capability_id)
-        items.append(
-            StatsResponse(
-                capability_id=stats.capability_id,
-                success_rate_7d=stats.success_rate_7d,
-                p95_latency_ms=stats.p95_latency_ms,
-                total_executions_7d=stats.total_executions_7d,
-                last_checked=stats.last_checked.isoformat()
-                if stats.last_checked
-                else None,
-                verified=stats.verified,
-                should_hide=should_hide(stats),
-                should_throttle=should_throttle(stats),
-            )
-        )
+    items = [_to_response(stats) for stats in await stats_store.all_stats()]
     return AllStatsResponse(items=items, total=len(items))
+
+
+def _to_response(stats: CapabilityStats) -> StatsResponse:
+    # Every field is computed server-side, so validation is skipped.
+    return StatsResponse.model_construct(
+        capability_id=stats.capability_id,
+        success_rate_7d=stats.success_rate_7d,
+        p95_latency_ms=stats.p95_latency_ms,
+        total_executions_7d=stats.total_executions_7d,
+        last_checked=stats.last_checked,
+        verified=stats.verified,
+        should_hide=should_hide(stats),
+        should_throttle=should_throttle(stats),
+    )
@@ -17,14 +17,24 @@ should_throttle(stats) -> bool
 
 from __future__ import annotations
 
+import asyncio
+import heapq
 import logging
+import time
+from collections.abc import Sequence
 from dataclasses import dataclass
 from datetime import UTC, datetime, timedelta
+from itertools import groupby
+from operator import attrgetter, itemgetter
+from typing import Any
 
 from moat_core.db import OutcomeEventRow
-from sqlalchemy import distinct, select
+from sqlalchemy import Insert, Row, case, func, lambda_stmt, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
+from app.clock import from_epoch_ms
 from app.config import settings
 
 logger = logging.getLogger(__name__)
@@ -32,20 +42,32 @@ logger = logging.getLogger(__name__)
 _WINDOW_DAYS = 7
 _WINDOW = timedelta(days=_WINDOW_DAYS)
 
+# The stats cache is keyed by requested capability_id; it is simply cleared if
+# lookups for many unknown ids ever push it past this size.
+_STATS_CACHE_MAX = 10_000
 
-@dataclass
+# (total, success_count, p95_latency_ms, last occurred_at) for one window.
+_Aggregate = tuple[int, int, float, datetime | None]
+_EMPTY_AGGREGATE: _Aggregate = (0, 0, 0.0, None)
+
+_SUCCESS = attrgetter("success")
+_LATENCY_MS = attrgetter("latency_ms")
+
+
+@dataclass(slots=True)
 class EventRecord:
     """Single outcome event recorded for a capability."""
 
     capability_id: str
     success: bool
     latency_ms: float
-    occurred_at: datetime
+    occurred_at_ms: int  # Unix epoch milliseconds
     tenant_id: str = ""
     receipt_id: str = ""
+    event_id: str = ""  # generated on write when empty
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class CapabilityStats:
     """Computed reliability stats for a single capability."""
 
@@ -60,16 +82,40 @@ class CapabilityStats:
 class StatsStore:
     """DB-backed rolling window stats store.
 
-    Persists outcome events and computes 7-day stats by querying
-    the database and aggregating in Python (works with both
-    Postgres and SQLite).
+    Persists outcome events and computes 7-day stats. On Postgres the
+    aggregation, p95 included, runs in a single SQL query; other backends
+    (SQLite) fetch the window's events and aggregate in Python.
     """
 
     def __init__(self) -> None:
         self._session_factory: async_sessionmaker[AsyncSession] | None = None
+        # capability_id -> (monotonic time cached, stats); see get_stats.
+        self._stats_cache: dict[str, tuple[float, CapabilityStats]] = {}
+        # (monotonic time cached, ids in query order, the same ids as a set)
+        self._ids_cache: tuple[float, list[str], frozenset[str]] | None = None
+        # Bumped after every committed write. A cache fill whose query started
+        # before a write finished is discarded rather than stored stale.
+        self._generation = 0
+        # Whether the backend supports ``percentile_cont ... WITHIN GROUP``.
+        self._sql_percentile = False
+        # Event INSERT for the configured backend; see _insert_events.
+        self._insert = _insert_events("sqlite")
+        # Events accepted by ingest but not yet written; ``None`` stops the
+        # writer (see run_writer / stop_writer).
+        self._queue: asyncio.Queue[EventRecord | None] = asyncio.Queue(
+            maxsize=settings.INGEST_QUEUE_SIZE
+        )
 
     def configure(self, session_factory: async_sessionmaker[AsyncSession]) -> None:
         self._session_factory = session_factory
+        bind = session_factory.kw.get("bind")
+        dialect = bind.dialect.name if bind is not None else ""
+        self._sql_percentile = dialect == "postgresql"
+        self._insert = _insert_events(dialect)
+        self._stats_cache.clear()
+        self._ids_cache = None
+        # A fresh queue per lifespan: asyncio queues bind to one event loop.
+        self._queue = asyncio.Queue(maxsize=settings.INGEST_QUEUE_SIZE)
 
     def _session(self) -> AsyncSession:
         if self._session_factory is None:
@@ -78,101 +124,416 @@ class StatsStore:
             )
         return self._session_factory()
 
-    async def record(self, event: EventRecord, event_id: str = "") -> None:
-        """Persist a new outcome event."""
+    async def record_many(self, events: Sequence[EventRecord]) -> int:
+        """Persist ``events`` with one multi-row INSERT and a single commit.
+
+        Events whose ``event_id`` is already stored, or repeats an earlier one
+        in ``events``, are skipped. If the batch INSERT fails anyway, the
+        events are retried one at a time so a single bad row does not lose
+        the rest. Returns the number of events written.
+        """
         from uuid import uuid4
 
-        async with self._session() as session:
-            row = OutcomeEventRow(
-                event_id=event_id or str(uuid4()),
-                capability_id=event.capability_id,
-                tenant_id=event.tenant_id,
-                receipt_id=event.receipt_id,
-                success=event.success,
-                latency_ms=event.latency_ms,
-                occurred_at=event.occurred_at,
+        rows: dict[str, dict[str, Any]] = {}
+        for event in events:
+            event_id = event.event_id or str(uuid4())
+            if event_id not in rows:
+                rows[event_id] = {
+                    "event_id": event_id,
+                    "capability_id": event.capability_id,
+                    "tenant_id": event.tenant_id,
+                    "receipt_id": event.receipt_id,
+                    "success": event.success,
+                    "latency_ms": event.latency_ms,
+                    "occurred_at": from_epoch_ms(event.occurred_at_ms),
+                }
+        if not rows:
+            return 0
+
+        try:
+            written = await self._insert_rows(list(rows.values()))
+        except SQLAlchemyError:
+            logger.warning(
+                "Batch insert failed; retrying events one at a time",
+                extra={"count": len(rows)},
+                exc_info=True,
             )
-            session.add(row)
+            written = 0
+            for row in rows.values():
+                try:
+                    written += await self._insert_rows([row])
+                except SQLAlchemyError:
+                    logger.exception(
+                        "Failed to persist outcome event",
+                        extra={"event_id": row["event_id"]},
+                    )
+        if not written:
+            return 0
+
+        self._generation += 1
+        known = self._ids_cache[2] if self._ids_cache is not None else frozenset()
+        for event in events:
+            self._stats_cache.pop(event.capability_id, None)
+            if event.capability_id not in known:
+                self._ids_cache = None
+        return written
+
+    async def _insert_rows(self, rows: list[dict[str, Any]]) -> int:
+        """INSERT ``rows`` in one transaction; return how many were new."""
+        async with self._session() as session:
+            result = await session.execute(self._insert, rows)
+            written = len(result.all())
             await session.commit()
+        return written
 
-        logger.debug(
-            "Event recorded",
-            extra={
-                "capability_id": event.capability_id,
-                "success": event.success,
-                "latency_ms": event.latency_ms,
-            },
-        )
+    # -- write-behind ingest -------------------------------------------------
+
+    def enqueue(self, event: EventRecord) -> bool:
+        """Queue ``event`` for the background writer.
+
+        Returns False, without queueing, when the queue is full.
+        """
+        try:
+            self._queue.put_nowait(event)
+        except asyncio.QueueFull:
+            return False
+        return True
+
+    async def run_writer(self) -> None:
+        """Write queued events in batches until :meth:`stop_writer` is called.
+
+        A batch is written once it holds ``INGEST_BATCH_SIZE`` events or
+        ``INGEST_FLUSH_INTERVAL_MS`` after its first event arrived, whichever
+        comes first. Duplicate events are skipped; see :meth:`record_many`.
+        """
+        queue = self._queue
+        loop = asyncio.get_running_loop()
+        linger = settings.INGEST_FLUSH_INTERVAL_MS / 1000
+        stopping = False
+        while not stopping:
+            item = await queue.get()
+            if item is None:
+                break
+            batch = [item]
+            deadline = loop.time() + linger
+            while len(batch) < settings.INGEST_BATCH_SIZE:
+                if queue.empty():
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        item = await asyncio.wait_for(queue.get(), timeout)
+                    except TimeoutError:
+                        break
+                else:
+                    item = queue.get_nowait()
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+            try:
+                await self.record_many(batch)
+            except Exception:
+                logger.exception(
+                    "Failed to persist outcome events",
+                    extra={"count": len(batch)},
+                )
+
+    async def stop_writer(self) -> None:
+        """Ask :meth:`run_writer` to exit once everything queued is written."""
+        await self._queue.put(None)
 
     async def get_stats(self, capability_id: str) -> CapabilityStats:
         """Compute current reliability stats for ``capability_id``.
 
-        Fetches events from the last 7 days and computes stats in Python.
+        Results, empty ones included, are cached for ``STATS_CACHE_TTL``
+        seconds; writing an event for the capability drops its entry.
+        """
+        entry = self._stats_cache.get(capability_id)
+        now = time.monotonic()
+        if entry is not None and now - entry[0] < settings.STATS_CACHE_TTL:
+            return entry[1]
+
+        generation = self._generation
+        return self._cache_stats(await self._compute_stats(capability_id), generation)
+
+    async def all_stats(self) -> list[CapabilityStats]:
+        """Compute stats for every capability that has recorded events.
+
+        One grouped query covers every capability rather than a
+        :meth:`get_stats` call each. Capabilities whose events have all
+        left the window get the same empty stats ``get_stats`` returns.
+        The results also refresh the per-capability cache.
         """
+        capability_ids = await self.all_capability_ids()
         cutoff = datetime.now(UTC) - _WINDOW
+        generation = self._generation
 
         async with self._session() as session:
-            stmt = (
-                select(OutcomeEventRow)
-                .where(OutcomeEventRow.capability_id == capability_id)
-                .where(OutcomeEventRow.occurred_at >= cutoff)
-                .order_by(OutcomeEventRow.occurred_at)
+            aggregate_all = (
+                _aggregate_all_sql if self._sql_percentile else _aggregate_all_python
             )
-            result = await session.execute(stmt)
-            rows = list(result.scalars().all())
-
-        total = len(rows)
-
-        if total == 0:
-            return CapabilityStats(
-                capability_id=capability_id,
-                success_rate_7d=1.0,
-                p95_latency_ms=0.0,
-                total_executions_7d=0,
-                last_checked=None,
-                verified=False,
+            aggregates = await aggregate_all(session, cutoff)
+
+        results = [
+            _build_stats(capability_id, aggregates.get(capability_id, _EMPTY_AGGREGATE))
+            # Ids written since the id list was cached still get reported.
+            for capability_id in dict.fromkeys([*capability_ids, *aggregates])
+        ]
+
+        if generation == self._generation:
+            now = time.monotonic()
+            if len(self._stats_cache) + len(results) > _STATS_CACHE_MAX:
+                self._stats_cache.clear()
+            for stats in results:
+                self._stats_cache[stats.capability_id] = (now, stats)
+        return results
+
+    def _cache_stats(self, stats: CapabilityStats, generation: int) -> CapabilityStats:
+        """Cache ``stats`` unless an event was written since ``generation``."""
+        if generation == self._generation:
+            if len(self._stats_cache) >= _STATS_CACHE_MAX:
+                self._stats_cache.clear()
+            self._stats_cache[stats.capability_id] = (time.monotonic(), stats)
+        return stats
+
+    async def _compute_stats(self, capability_id: str) -> CapabilityStats:
+        cutoff = datetime.now(UTC) - _WINDOW
+
+        async with self._session() as session:
+            aggregate = _aggregate_sql if self._sql_percentile else _aggregate_python
+            result = await aggregate(session, capability_id, cutoff)
+        return _build_stats(capability_id, result)
+
+    async def total_events_7d(self) -> int:
+        """Return the number of events, across all capabilities, in the window.
+
+        Issues a single ``COUNT`` rather than computing stats per capability.
+        """
+        cutoff = datetime.now(UTC) - _WINDOW
+
+        async with self._session() as session:
+            stmt = lambda_stmt(
+                lambda: (
+                    select(func.count())
+                    .select_from(OutcomeEventRow)
+                    .where(OutcomeEventRow.occurred_at >= cutoff)
+                )
             )
+            return (await session.execute(stmt)).scalar_one()
 
-        success_count = sum(1 for r in rows if r.success)
-        success_rate = success_count / total
+    async def all_capability_ids(self) -> list[str]:
+        """Return all capability IDs that have recorded events."""
+        _, ids, _ = await self._capability_ids()
+        return list(ids)
 
-        latencies = sorted(r.latency_ms for r in rows)
-        p95_latency = _percentile(latencies, 95)
+    async def _capability_ids(self) -> tuple[float, list[str], frozenset[str]]:
+        """Return the cached capability id listing, refreshing it if stale.
 
-        verified = total >= 10 and success_rate >= settings.MIN_SUCCESS_RATE_7D
+        The ``DISTINCT`` scan is cached for ``CAPABILITY_IDS_CACHE_TTL``
+        seconds, or until an event for a new capability is written.
+        """
+        cached = self._ids_cache
+        if (
+            cached is not None
+            and time.monotonic() - cached[0] < settings.CAPABILITY_IDS_CACHE_TTL
+        ):
+            return cached
+
+        generation = self._generation
+        async with self._session() as session:
+            stmt = lambda_stmt(lambda: select(OutcomeEventRow.capability_id).distinct())
+            result = await session.execute(stmt)
+            ids = [row[0] for row in result.all()]
+        cached = (time.monotonic(), ids, frozenset(ids))
+        if generation == self._generation:
+            self._ids_cache = cached
+        return cached
+
+
+def _insert_events(dialect: str) -> Insert:
+    """Multi-row event INSERT that skips ids already stored.
+
+    ``ON CONFLICT (event_id) DO NOTHING`` is spelled the same on Postgres and
+    SQLite, the two supported backends. ``RETURNING`` reports which rows were
+    actually inserted.
+    """
+    insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+    table = OutcomeEventRow.__table__
+    return (
+        insert(table)
+        .on_conflict_do_nothing(index_elements=[table.c.event_id])
+        .returning(table.c.event_id)
+    )
+
+
+# ---------------------------------------------------------------------------
+# Window aggregation
+# ---------------------------------------------------------------------------
+#
+# Read queries, here and in StatsStore, use ``lambda_stmt``: each is built and its
+# cache key computed once per call site, after which only the bound values
+# (capability_id, cutoff) are extracted from the lambda's closure per call.
 
-        last_event = max(rows, key=lambda r: r.occurred_at)
 
+def _sql_aggregates() -> tuple[Any, ...]:
+    """Window aggregate columns, in :data:`_Aggregate` order, for Postgres.
+
+    ``percentile_cont`` interpolates linearly between ranks, matching
+    :func:`_percentile`.
+    """
+    return (
+        func.count(),
+        func.sum(case((OutcomeEventRow.success, 1), else_=0)),
+        func.percentile_cont(0.95).within_group(OutcomeEventRow.latency_ms.asc()),
+        func.max(OutcomeEventRow.occurred_at),
+    )
+
+
+async def _aggregate_sql(
+    session: AsyncSession, capability_id: str, cutoff: datetime
+) -> _Aggregate:
+    """Aggregate one capability's window in a single query.
+
+    The capability/time filter is a range seek on ``ix_outcome_events_cap_time``.
+    """
+    stmt = lambda_stmt(
+        lambda: (
+            select(*_sql_aggregates())
+            .where(OutcomeEventRow.capability_id == capability_id)
+            .where(OutcomeEventRow.occurred_at >= cutoff)
+        )
+    )
+    total, success_count, p95_latency, last_checked = (
+        await session.execute(stmt)
+    ).one()
+    return total, success_count or 0, p95_latency or 0.0, last_checked
+
+
+async def _aggregate_all_sql(
+    session: AsyncSession, cutoff: datetime
+) -> dict[str, _Aggregate]:
+    """Aggregate every capability's window in a single grouped query."""
+    stmt = lambda_stmt(
+        lambda: (
+            select(OutcomeEventRow.capability_id, *_sql_aggregates())
+            .where(OutcomeEventRow.occurred_at >= cutoff)
+            .group_by(OutcomeEventRow.capability_id)
+        )
+    )
+    return {
+        capability_id: (total, success_count, p95_latency, last_checked)
+        for capability_id, total, success_count, p95_latency, last_checked in (
+            await session.execute(stmt)
+        )
+    }
+
+
+async def _aggregate_python(
+    session: AsyncSession, capability_id: str, cutoff: datetime
+) -> _Aggregate:
+    """Fetch one capability's window and aggregate it in Python."""
+    # Only the three aggregated columns, as plain rows rather than ORM
+    # objects; nothing here needs the identity map. ix_outcome_events_cap_time
+    # serves both the filter and the ordering.
+    stmt = lambda_stmt(
+        lambda: (
+            select(
+                OutcomeEventRow.success,
+                OutcomeEventRow.latency_ms,
+                OutcomeEventRow.occurred_at,
+            )
+            .where(OutcomeEventRow.capability_id == capability_id)
+            .where(OutcomeEventRow.occurred_at >= cutoff)
+            .order_by(OutcomeEventRow.occurred_at)
+        )
+    )
+    return _aggregate_rows((await session.execute(stmt)).all())
+
+
+async def _aggregate_all_python(
+    session: AsyncSession, cutoff: datetime
+) -> dict[str, _Aggregate]:
+    """Fetch every capability's window in one query and aggregate in Python."""
+    stmt = lambda_stmt(
+        lambda: (
+            select(
+                OutcomeEventRow.capability_id,
+                OutcomeEventRow.success,
+                OutcomeEventRow.latency_ms,
+                OutcomeEventRow.occurred_at,
+            )
+            .where(OutcomeEventRow.occurred_at >= cutoff)
+            .order_by(OutcomeEventRow.capability_id, OutcomeEventRow.occurred_at)
+        )
+    )
+    rows = (await session.execute(stmt)).all()
+    return {
+        capability_id: _aggregate_rows(list(group))
+        for capability_id, group in groupby(rows, key=itemgetter(0))
+    }
+
+
+def _aggregate_rows(rows: Sequence[Row[Any]]) -> _Aggregate:
+    """Aggregate window rows ordered by ``occurred_at``."""
+    if not rows:
+        return _EMPTY_AGGREGATE
+
+    # Columns are pulled out with map/attrgetter and success flags summed as
+    # ints, so no per-row Python bytecode runs. Rows are ordered by
+    # occurred_at, so the last row is the most recent event.
+    success_count = sum(map(_SUCCESS, rows))
+    p95_latency = _percentile(list(map(_LATENCY_MS, rows)), 95)
+    return len(rows), success_count, p95_latency, rows[-1].occurred_at
+
+
+def _build_stats(capability_id: str, aggregate: _Aggregate) -> CapabilityStats:
+    """Turn a window aggregate into rounded stats with the verified flag."""
+    total, success_count, p95_latency, last_checked = aggregate
+    if total == 0:
         return CapabilityStats(
             capability_id=capability_id,
-            success_rate_7d=round(success_rate, 4),
-            p95_latency_ms=round(p95_latency, 2),
-            total_executions_7d=total,
-            last_checked=last_event.occurred_at,
-            verified=verified,
+            success_rate_7d=1.0,
+            p95_latency_ms=0.0,
+            total_executions_7d=0,
+            last_checked=None,
+            verified=False,
         )
 
-    async def all_capability_ids(self) -> list[str]:
-        """Return all capability IDs that have recorded events."""
-        async with self._session() as session:
-            stmt = select(distinct(OutcomeEventRow.capability_id))
-            result = await session.execute(stmt)
-            return [row[0] for row in result.all()]
+    success_rate = success_count / total
+
+    verified = total >= 10 and success_rate >= settings.MIN_SUCCESS_RATE_7D
 
+    return CapabilityStats(
+        capability_id=capability_id,
+        success_rate_7d=round(success_rate, 4),
+        p95_latency_ms=round(p95_latency, 2),
+        total_executions_7d=total,
+        last_checked=last_checked,
+        verified=verified,
+    )
 
-def _percentile(sorted_values: list[float], pct: int) -> float:
-    """Compute the ``pct``-th percentile of a sorted list using linear interpolation."""
-    if not sorted_values:
+
+def _percentile(values: Sequence[float], pct: int) -> float:
+    """Compute the ``pct``-th percentile of ``values`` using linear interpolation.
+
+    ``values`` need not be sorted. Only the values at or above the
+    percentile's rank are ordered (``heapq.nlargest``), which for a high
+    percentile such as p95 is a small fraction of the list.
+    """
+    n = len(values)
+    if n == 0:
         return 0.0
-    if len(sorted_values) == 1:
-        return sorted_values[0]
-    k = (len(sorted_values) - 1) * pct / 100
+    if n == 1:
+        return values[0]
+    k = (n - 1) * pct / 100
     lo = int(k)
-    hi = lo + 1
-    if hi >= len(sorted_values):
-        return sorted_values[-1]
+    # Ranks lo and lo + 1 are the two smallest of the n - lo largest values.
+    top = heapq.nlargest(n - lo, values)
+    if lo + 1 >= n:
+        return top[-1]
     frac = k - lo
-    return sorted_values[lo] + frac * (sorted_values[hi] - sorted_values[lo])
+    return top[-1] + frac * (top[-2] - top[-1])
 
 
 def should_hide(stats: CapabilityStats) -> bool:
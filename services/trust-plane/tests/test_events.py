@@ -0,0 +1,158 @@
+"""
+Tests for the trust-plane outcome event ingestion API.
+
+All tests use a real temporary SQLite database — no mocks.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+
+
+def _event(event_id: str, **overrides):
+    """Base outcome event payload."""
+    base = {
+        "event_id": event_id,
+        "capability_id": "cap-batch",
+        "execution_status": "success",
+        "latency_ms": 12.5,
+    }
+    base.update(overrides)
+    return base
+
+
+class TestEventBatch:
+    """Test POST /events/batch."""
+
+    def test_batch_ingest(self, test_client):
+        """Every valid event is written."""
+        resp = test_client.post(
+            "/events/batch",
+            json={"events": [_event("batch-1"), _event("batch-2")]},
+        )
+        assert resp.status_code == 200
+        assert resp.json() == {"processed": 2, "failed": 0}
+
+    def test_batch_skips_duplicates(self, test_client):
+        """A repeated event_id in the batch is skipped, not fatal to the rest."""
+        resp = test_client.post(
+            "/events/batch",
+            json={
+                "events": [
+                    _event("dup-1", capability_id="cap-dup"),
+                    _event("dup-2", capability_id="cap-dup"),
+                    _event("dup-1", capability_id="cap-dup"),
+                ]
+            },
+        )
+        assert resp.status_code == 200
+        assert resp.json() == {"processed": 2, "failed": 1}
+
+        stats = test_client.get("/capabilities/cap-dup/stats").json()
+        assert stats["total_executions_7d"] == 2
+
+    def test_batch_skips_already_ingested(self, test_client):
+        """Events already stored by an earlier batch are counted as failed."""
+        test_client.post("/events/batch", json={"events": [_event("seen-1")]})
+        resp = test_client.post(
+            "/events/batch",
+            json={"events": [_event("seen-1"), _event("seen-2")]},
+        )
+        assert resp.status_code == 200
+        assert resp.json() == {"processed": 1, "failed": 1}
+
+    def test_batch_skips_invalid_events(self, test_client):
+        """Events failing validation are counted as failed."""
+        resp = test_client.post(
+            "/events/batch",
+            json={"events": [_event("valid-1"), {"capability_id": "cap-batch"}]},
+        )
+        assert resp.status_code == 200
+        assert resp.json() == {"processed": 1, "failed": 1}
+
+    def test_batch_rejects_oversized_ids(self, test_client):
+        """Ids longer than their columns fail validation instead of the insert."""
+        resp = test_client.post(
+            "/events/batch",
+            json={
+                "events": [
+                    _event("sized-1"),
+                    _event("x" * 65),
+                    _event("sized-2", capability_id="c" * 65),
+                    _event("sized-3", tenant_id="t" * 129),
+                ]
+            },
+        )
+        assert resp.status_code == 200
+        assert resp.json() == {"processed": 1, "failed": 3}
+
+
+class TestEventIngest:
+    """Test POST /events."""
+
+    def test_ingested_event_reaches_stats_after_flush(self, test_client):
+        """The writer persists an accepted event within its flush interval."""
+        resp = test_client.post(
+            "/events", json=_event("flush-1", capability_id="cap-f")
+        )
+        assert resp.status_code == 201
+        assert resp.json()["accepted"] is True
+
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline:
+            stats = test_client.get("/capabilities/cap-f/stats").json()
+            if stats["total_executions_7d"] == 1:
+                break
+            time.sleep(0.05)
+        assert stats["total_executions_7d"] == 1
+
+    def test_shutdown_drains_queued_events(self, monkeypatch):
+        """Events still queued at shutdown are written before the app stops."""
+        from fastapi.testclient import TestClient
+
+        from app.main import app
+        from app.scoring import settings
+
+        # Long enough that only stop_writer can flush the batch.
+        monkeypatch.setattr(settings, "INGEST_FLUSH_INTERVAL_MS", 60_000)
+        with TestClient(app) as client:
+            for i in range(3):
+                resp = client.post(
+                    "/events", json=_event(f"drain-{i}", capability_id="cap-dr")
+                )
+                assert resp.status_code == 201
+
+        with TestClient(app) as client:
+            stats = client.get("/capabilities/cap-dr/stats").json()
+        assert stats["total_executions_7d"] == 3
+
+    def test_full_queue_returns_429(self, test_client):
+        """A full ingest queue rejects the event instead of blocking."""
+        from app.scoring import stats_store
+
+        queue = stats_store._queue
+        stats_store._queue = asyncio.Queue(maxsize=1)
+        stats_store._queue.put_nowait(None)
+        try:
+            resp = test_client.post("/events", json=_event("full-1"))
+        finally:
+            stats_store._queue = queue
+        assert resp.status_code == 429
+
+    def test_rejects_oversized_event_id(self, test_client):
+        """A single event with an overlong event_id is a validation error."""
+        resp = test_client.post("/events", json=_event("x" * 65))
+        assert resp.status_code == 422
+        assert resp.json()["detail"][0]["loc"] == ["body", "event_id"]
+
+    def test_validation_errors_use_fastapi_locs(self, test_client):
+        """Missing fields are reported under ``body``, as FastAPI does."""
+        resp = test_client.post("/events", json={"capability_id": "cap-loc"})
+        assert resp.status_code == 422
+        locs = [error["loc"] for error in resp.json()["detail"]]
+        assert locs == [["body", "event_id"], ["body", "execution_status"]]
+
+        resp = test_client.post("/events/batch", json={"events": []})
+        assert resp.status_code == 422
+        assert resp.json()["detail"][0]["loc"] == ["body", "events"]